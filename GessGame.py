@@ -7,6 +7,687 @@
 #                      in the GessGame class to create a piece which then acts as the current piece in the Board class.
 #                      I believe when Gradescope tries to make a move, Board._current_piece is still None.
 
+import argparse
+import random
+import struct
+import sys
+import time
+from types import MappingProxyType
+
+
+BLACK = 0  # index of the black player's stones in a Position
+WHITE = 1  # index of the white player's stones in a Position
+BOARD_SIZE = 20  # squares per side, including the edge columns a/t and rows 1/20
+GAME_STATES = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+
+
+# layout of GessGame.to_bytes: version, black stones, white stones, side to move, index of the game state in
+# GAME_STATES, then remaining stones and rings of the black and then the white player
+GAME_BYTES = struct.Struct('<B50s50sBBBBBB')
+GAME_BYTES_VERSION = 1
+
+
+def _square_mask(row, column):
+    """
+    Builds the bit for a single square of the bitboard
+    :param row: internal row number, 0 being row 20 on the printed board
+    :param column: column number, 0 being column 'a'
+    :return: int with only the bit for that square set
+    """
+    return 1 << (row * BOARD_SIZE + column)
+
+
+FULL_MASK = (1 << BOARD_SIZE * BOARD_SIZE) - 1
+# columns a and t and rows 1 and 20 - any stones left here are removed at the end of a move
+EDGE_MASK = 0
+for _i in range(BOARD_SIZE):
+    EDGE_MASK |= _square_mask(0, _i) | _square_mask(BOARD_SIZE - 1, _i)
+    EDGE_MASK |= _square_mask(_i, 0) | _square_mask(_i, BOARD_SIZE - 1)
+# squares that can be the center of a piece (columns b-s and rows 2-19)
+CENTER_MASK = FULL_MASK & ~EDGE_MASK
+# (row, column) steps in the same order the directions are listed in FOOTPRINT_NAMES
+DIRECTIONS = ((-1, 0), (-1, -1), (-1, 1), (0, -1), (0, 1), (1, 0), (1, -1), (1, 1))
+DIRECTION_OFFSETS = tuple(row * BOARD_SIZE + column for row, column in DIRECTIONS)
+# FOOTPRINT[square] covers the 3x3 window around a center square, RING[square] the same window without the center
+FOOTPRINT = [0] * (BOARD_SIZE * BOARD_SIZE)
+RING = [0] * (BOARD_SIZE * BOARD_SIZE)
+for _row in range(1, BOARD_SIZE - 1):
+    for _column in range(1, BOARD_SIZE - 1):
+        _center = _row * BOARD_SIZE + _column
+        for _row_step, _column_step in DIRECTIONS:
+            RING[_center] |= _square_mask(_row + _row_step, _column + _column_step)
+        FOOTPRINT[_center] = RING[_center] | _square_mask(_row, _column)
+# names of the squares of a piece's footprint, the center first and then the directions in the order of DIRECTIONS
+FOOTPRINT_NAMES = ('center', 'north', 'north_west', 'north_east', 'west', 'east', 'south', 'south_west', 'south_east')
+# FOOTPRINT_SQUARES[square] lists the squares of the footprint around a center in the order of FOOTPRINT_NAMES
+FOOTPRINT_SQUARES = [()] * (BOARD_SIZE * BOARD_SIZE)
+for _center in range(BOARD_SIZE * BOARD_SIZE):
+    if FOOTPRINT[_center]:
+        FOOTPRINT_SQUARES[_center] = (_center,) + tuple(_center + _offset for _offset in DIRECTION_OFFSETS)
+# AFFECTED[square] holds every center whose 3x3 window overlaps the window around square, which are the only
+# rings a piece leaving or landing on square can make or break
+AFFECTED = [0] * (BOARD_SIZE * BOARD_SIZE)
+for _center in range(BOARD_SIZE * BOARD_SIZE):
+    if FOOTPRINT[_center]:
+        _window = FOOTPRINT[_center]
+        for _offset in DIRECTION_OFFSETS:
+            _window |= FOOTPRINT[_center] << _offset if _offset > 0 else FOOTPRINT[_center] >> -_offset
+        AFFECTED[_center] = _window & CENTER_MASK
+
+# RAYS[center][k] lists the squares the center of a piece can slide to in direction k, in order, until the center
+# would leave columns b-s and rows 2-19. SHORT_RAYS caps them at the 3 squares a piece without a center stone can move.
+RAYS = [()] * (BOARD_SIZE * BOARD_SIZE)
+SHORT_RAYS = [()] * (BOARD_SIZE * BOARD_SIZE)
+# LEADING_EDGE[k][square] holds the squares a piece moving in direction k covers when its center reaches square that
+# it did not cover one step earlier, so an obstruction only has to be looked for there
+LEADING_EDGE = [[0] * (BOARD_SIZE * BOARD_SIZE) for _offset in DIRECTION_OFFSETS]
+for _row in range(1, BOARD_SIZE - 1):
+    for _column in range(1, BOARD_SIZE - 1):
+        _center = _row * BOARD_SIZE + _column
+        _rays = []
+        for _k, (_row_step, _column_step) in enumerate(DIRECTIONS):
+            _ray = []
+            _distance = 1
+            while 0 < _row + _row_step * _distance < BOARD_SIZE - 1 and \
+                    0 < _column + _column_step * _distance < BOARD_SIZE - 1:
+                _ray.append(_center + DIRECTION_OFFSETS[_k] * _distance)
+                _distance += 1
+            _rays.append(tuple(_ray))
+            _previous = _center - DIRECTION_OFFSETS[_k]
+            if CENTER_MASK >> _previous & 1:
+                LEADING_EDGE[_k][_center] = FOOTPRINT[_center] & ~FOOTPRINT[_previous]
+        RAYS[_center] = tuple(_rays)
+        SHORT_RAYS[_center] = tuple(_ray[:3] for _ray in _rays)
+
+# Zobrist keys for hashing a Position, one random 64-bit number for each side and square plus one that is mixed in
+# while white is to move. A fixed seed keeps hashes the same between runs so they can be saved.
+_zobrist_random = random.Random(20200604)
+ZOBRIST = [[_zobrist_random.getrandbits(64) for _square in range(BOARD_SIZE * BOARD_SIZE)] for _side in (BLACK, WHITE)]
+ZOBRIST_WHITE_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
+# SQUARE_NAMES[square] is the coordinate shown to the players, e.g. 'g5', and SQUARE_INDEXES maps it back. Squares
+# are ints everywhere inside the game, and these are only used where coordinates come in or go out.
+SQUARE_NAMES = tuple(chr(ord('a') + _square % BOARD_SIZE) + str(BOARD_SIZE - _square // BOARD_SIZE)
+                     for _square in range(BOARD_SIZE * BOARD_SIZE))
+SQUARE_INDEXES = {_name: _square for _square, _name in enumerate(SQUARE_NAMES)}
+
+# lookup tables for the coordinates Board works with, built once at import and shared read-only by every Board.
+# Board's coordinates use the internal row numbers, e.g. 'g15' for g5.
+ALPHA_TO_INDEX = MappingProxyType({chr(ord('a') + _column): _column for _column in range(BOARD_SIZE)})
+INDEX_TO_ALPHA = MappingProxyType({_column: _letter for _letter, _column in ALPHA_TO_INDEX.items()})
+FLIP_NUMBERS = MappingProxyType({str(_row): str(BOARD_SIZE - _row) for _row in range(BOARD_SIZE + 1)})
+OUT_OF_BOUNDS_COLUMNS = frozenset(('a', 't'))
+OUT_OF_BOUNDS_ROWS = frozenset(('0', '19'))
+# labels print_board shows beside the rows and under the columns, kept out of the board itself
+ROW_LABELS = tuple(str(BOARD_SIZE - _row) for _row in range(BOARD_SIZE))
+COLUMN_LABELS = tuple(INDEX_TO_ALPHA[_column] for _column in range(BOARD_SIZE))
+
+# stones of the starting position
+START_BLACK_STONES = 0
+START_WHITE_STONES = 0
+for _letter in 'ceghijklmnpr':  # rows 2, 4, 17 and 19
+    START_WHITE_STONES |= _square_mask(1, ALPHA_TO_INDEX[_letter]) | _square_mask(3, ALPHA_TO_INDEX[_letter])
+    START_BLACK_STONES |= _square_mask(16, ALPHA_TO_INDEX[_letter]) | _square_mask(18, ALPHA_TO_INDEX[_letter])
+for _letter in 'bcdfhijkmoqrs':  # rows 3 and 18
+    START_WHITE_STONES |= _square_mask(2, ALPHA_TO_INDEX[_letter])
+    START_BLACK_STONES |= _square_mask(17, ALPHA_TO_INDEX[_letter])
+for _letter in 'cfilor':  # rows 7 and 14
+    START_WHITE_STONES |= _square_mask(6, ALPHA_TO_INDEX[_letter])
+    START_BLACK_STONES |= _square_mask(13, ALPHA_TO_INDEX[_letter])
+
+
+def square_index(coordinate):
+    """
+    Converts a coordinate shown to the players to its square index
+    :param coordinate: coordinate such as 'g5'
+    :return: square index, row * 20 + column where row 0 is row 20 on the printed board
+    """
+    try:
+        return SQUARE_INDEXES[coordinate]
+    except (KeyError, TypeError):
+        raise ValueError("not a square on the board: {!r}".format(coordinate)) from None
+
+
+def square_name(square):
+    """
+    Converts a square index to the coordinate shown to the players
+    :param square: square index
+    :return: coordinate such as 'g5'
+    """
+    return SQUARE_NAMES[square]
+
+
+def bitboard_squares(mask):
+    """
+    Lists the squares set in a bitboard
+    :param mask: the bitboard
+    :return: list of square indexes, lowest first
+    """
+    squares = []
+    while mask:
+        lowest = mask & -mask
+        squares.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return squares
+
+
+def _shift(mask, offset):
+    """
+    Moves every bit of a mask by the same number of squares. Bits that wrap around into the edge columns
+    are harmless as long as the result is only read on center squares.
+    :param mask: bitboard to move
+    :param offset: number of squares to move by, can be negative
+    :return: the shifted bitboard
+    """
+    if offset >= 0:
+        return (mask << offset) & FULL_MASK
+    return mask >> -offset
+
+
+def _any_neighbor(mask):
+    """
+    Finds every center square that has at least one bit of the mask in its 3x3 window (not counting the center)
+    :param mask: bitboard of stones
+    :return: bitboard of center squares
+    """
+    neighbors = 0
+    for offset in DIRECTION_OFFSETS:
+        neighbors |= _shift(mask, -offset)
+    return neighbors & CENTER_MASK
+
+
+def _all_neighbors(mask, centers=CENTER_MASK):
+    """
+    Finds every center square whose eight surrounding squares are all set in the mask
+    :param mask: bitboard of stones
+    :param centers: bitboard of the center squares to check, every center square by default
+    :return: bitboard of center squares
+    """
+    for offset in DIRECTION_OFFSETS:
+        if not centers:
+            break
+        centers &= _shift(mask, -offset)
+    return centers
+
+
+def _internal_coordinate(square):
+    """
+    Converts a square index to a coordinate using the board's row numbers
+    :param square: square index
+    :return: coordinate such as 'g15' for g5
+    """
+    row, column = divmod(square, BOARD_SIZE)
+    return chr(ord('a') + column) + str(row)
+
+
+def _square_value(position, square):
+    """
+    Looks up what is on a square
+    :param position: Position to look in
+    :param square: square index
+    :return: 'b' for a black stone, 'w' for a white stone and ' ' for an empty square
+    """
+    if position.get_stones(BLACK) >> square & 1:
+        return 'b'
+    if position.get_stones(WHITE) >> square & 1:
+        return 'w'
+    return ' '
+
+
+class Position:
+    """
+    Class to represent the stones on the board as two bitboards, one int for each player. Bit
+    row * 20 + column is set when the player has a stone on that square, where row 0 is row 20 on the
+    printed board and column 0 is column 'a'.
+    Responsibilities:
+    Knows where every stone is
+    Keeps up with the rings of both sides, rechecking only the centers a move can affect, and with the valid
+    piece centers, worked out again when they are next needed after the stones change
+    Calculates the possible moves of a piece
+    Moves pieces, removing captured stones and stones left on the edge of the board
+    Can take back moves made with push_move
+    Keeps a Zobrist hash of the stones and the side to move, updated with every move
+    Collaborators:
+    none
+    """
+
+    __slots__ = ('_stones', '_rings', '_ring_counts', '_pieces', '_pieces_dirty', '_undo_stones', '_undo_rings',
+                 '_undo_hashes', '_undo_sides', '_ply', '_side_to_move', '_hash')
+
+    def __init__(self, black_stones=0, white_stones=0):
+        """
+        Init method to initialize a Position object
+        :param black_stones: bitboard of the black stones
+        :param white_stones: bitboard of the white stones
+        """
+        self._stones = [black_stones, white_stones]
+        self._rings = [0, 0]
+        self._ring_counts = [0, 0]
+        # bitboards of the valid piece centers of each side, worked out again the next time they are asked for
+        # whenever _pieces_dirty is set by a change to the stones
+        self._pieces = [0, 0]
+        self._pieces_dirty = True
+        self._update_rings(CENTER_MASK)
+        # undo stack, one entry per pushed move holding the XOR of the squares that changed. The lists only
+        # grow the first time a depth is reached and are reused after that.
+        self._undo_stones = [[], []]
+        self._undo_rings = [[], []]
+        self._undo_hashes = []
+        self._undo_sides = []
+        self._ply = 0
+        self._side_to_move = BLACK
+        self._hash = self._hash_squares(BLACK, black_stones) ^ self._hash_squares(WHITE, white_stones)
+
+    def copy(self):
+        """
+        Makes a copy of the stones, rings, hash and side to move, without the undo stack
+        :return: the new Position
+        """
+        position = Position.__new__(Position)
+        position._stones = self._stones[:]
+        position._rings = self._rings[:]
+        position._ring_counts = self._ring_counts[:]
+        position._pieces = self._pieces[:]
+        position._pieces_dirty = self._pieces_dirty
+        position._undo_stones = [[], []]
+        position._undo_rings = [[], []]
+        position._undo_hashes = []
+        position._undo_sides = []
+        position._ply = 0
+        position._side_to_move = self._side_to_move
+        position._hash = self._hash
+        return position
+
+    def snapshot(self):
+        """
+        Captures the stones, rings, piece centers, side to move and hash, but not the undo stack
+        :return: tuple that can be given to restore any number of times
+        """
+        if self._pieces_dirty:
+            self._refresh_pieces()
+        return (self._stones[BLACK], self._stones[WHITE], self._rings[BLACK], self._rings[WHITE],
+                self._pieces[BLACK], self._pieces[WHITE], self._side_to_move, self._hash)
+
+    def restore(self, snapshot):
+        """
+        Goes back to a snapshot, emptying the undo stack
+        :param snapshot: tuple from snapshot
+        :return: none
+        """
+        black_stones, white_stones, black_rings, white_rings, black_pieces, white_pieces, self._side_to_move, \
+            self._hash = snapshot
+        self._stones[BLACK] = black_stones
+        self._stones[WHITE] = white_stones
+        self._rings[BLACK] = black_rings
+        self._rings[WHITE] = white_rings
+        self._ring_counts[BLACK] = black_rings.bit_count()
+        self._ring_counts[WHITE] = white_rings.bit_count()
+        self._pieces[BLACK] = black_pieces
+        self._pieces[WHITE] = white_pieces
+        self._pieces_dirty = False
+        self._ply = 0
+
+    def load(self, black_stones, white_stones, side_to_move):
+        """
+        Replaces every stone and the side to move, working the rings and hash out again and emptying the undo stack
+        :param black_stones: bitboard of the black stones
+        :param white_stones: bitboard of the white stones
+        :param side_to_move: BLACK or WHITE
+        :return: none
+        """
+        self._stones[BLACK] = black_stones & CENTER_MASK
+        self._stones[WHITE] = white_stones & CENTER_MASK
+        self._update_rings(CENTER_MASK)
+        self._pieces_dirty = True
+        self._side_to_move = side_to_move
+        self._hash = self._hash_squares(BLACK, self._stones[BLACK]) ^ self._hash_squares(WHITE, self._stones[WHITE])
+        if side_to_move == WHITE:
+            self._hash ^= ZOBRIST_WHITE_TO_MOVE
+        self._ply = 0
+
+    def get_stones(self, side):
+        """
+        Getter method
+        :param side: BLACK or WHITE
+        :return: bitboard of that side's stones
+        """
+        return self._stones[side]
+
+    def set_stones(self, side, stones):
+        """
+        Setter method, stones on the edge of the board are dropped
+        :param side: BLACK or WHITE
+        :param stones: bitboard of that side's stones
+        :return: none
+        """
+        self._hash ^= self._hash_squares(side, self._stones[side] ^ stones & CENTER_MASK)
+        self._stones[side] = stones & CENTER_MASK
+        self._update_rings(CENTER_MASK)
+        self._pieces_dirty = True
+
+    def get_side_to_move(self):
+        """
+        Getter method
+        :return: BLACK or WHITE, the side that moves next
+        """
+        return self._side_to_move
+
+    def set_side_to_move(self, side):
+        """
+        Setter method
+        :param side: BLACK or WHITE
+        :return: none
+        """
+        if side != self._side_to_move:
+            self._side_to_move = side
+            self._hash ^= ZOBRIST_WHITE_TO_MOVE
+
+    def get_hash(self):
+        """
+        Getter method
+        :return: 64-bit Zobrist hash of the stones and the side to move
+        """
+        return self._hash
+
+    @staticmethod
+    def _hash_squares(side, squares):
+        """
+        Combines the Zobrist keys of a side for every square in a mask
+        :param side: BLACK or WHITE
+        :param squares: bitboard of the squares to hash
+        :return: XOR of the keys
+        """
+        keys = ZOBRIST[side]
+        combined = 0
+        while squares:
+            lowest = squares & -squares
+            combined ^= keys[lowest.bit_length() - 1]
+            squares ^= lowest
+        return combined
+
+    def get_occupied(self):
+        """
+        Getter method
+        :return: bitboard of every square with a stone on it
+        """
+        return self._stones[BLACK] | self._stones[WHITE]
+
+    def is_a_piece(self, center, side):
+        """
+        Checks if a square can be the center of a piece for the given side. A piece must be on the board, contain
+        no opposing stones and have at least one of the side's stones around its center.
+        :param center: square index
+        :param side: BLACK or WHITE
+        :return: True if it is a valid piece, False otherwise
+        """
+        if self._pieces_dirty:
+            self._refresh_pieces()
+        return center >= 0 and self._pieces[side] >> center & 1 == 1
+
+    def piece_centers(self, side):
+        """
+        Gets every valid piece center of a side, working them out again first if the stones have changed since
+        the last call
+        :param side: BLACK or WHITE
+        :return: bitboard of the center squares
+        """
+        if self._pieces_dirty:
+            self._refresh_pieces()
+        return self._pieces[side]
+
+    def long_range_centers(self, side):
+        """
+        Finds the valid piece centers of a side with a stone on the center, which are the pieces that can move
+        any distance
+        :param side: BLACK or WHITE
+        :return: bitboard of the center squares
+        """
+        return self.piece_centers(side) & self._stones[side]
+
+    def scan_piece_centers(self, side):
+        """
+        Finds every valid piece center of a side by checking the whole board
+        :param side: BLACK or WHITE
+        :return: bitboard of the center squares
+        """
+        opposing = self._stones[1 - side]
+        blocked = opposing | _any_neighbor(opposing)
+        return _any_neighbor(self._stones[side]) & ~blocked
+
+    def _refresh_pieces(self):
+        """
+        Works out the valid piece centers of both sides again. Checking the whole board with a few shifts of the
+        bitboards costs less than checking only the centers near the moves that changed it one by one.
+        :return: none
+        """
+        self._pieces_dirty = False
+        black_stones, white_stones = self._stones
+        black_neighbors = _any_neighbor(black_stones)
+        white_neighbors = _any_neighbor(white_stones)
+        self._pieces[BLACK] = black_neighbors & ~(white_stones | white_neighbors)
+        self._pieces[WHITE] = white_neighbors & ~(black_stones | black_neighbors)
+
+    def get_rings(self, side):
+        """
+        Getter method
+        :param side: BLACK or WHITE
+        :return: bitboard of the side's ring centers
+        """
+        return self._rings[side]
+
+    def get_ring_count(self, side):
+        """
+        Getter method
+        :param side: BLACK or WHITE
+        :return: number of rings the side has
+        """
+        return self._ring_counts[side]
+
+    def scan_rings(self, side):
+        """
+        Finds every ring of a side by checking the whole board, where a ring is an empty center square
+        surrounded by eight of the side's stones
+        :param side: BLACK or WHITE
+        :return: bitboard of the ring centers
+        """
+        return _all_neighbors(self._stones[side]) & ~self.get_occupied()
+
+    def _update_rings(self, region):
+        """
+        Rechecks the rings of both sides on the center squares in region and keeps the rest as they were
+        :param region: bitboard of the centers that may have changed
+        :return: none
+        """
+        empty = region & ~(self._stones[BLACK] | self._stones[WHITE])
+        for side in (BLACK, WHITE):
+            rings = _all_neighbors(self._stones[side], empty)
+            self._rings[side] = self._rings[side] & ~region | rings
+            self._ring_counts[side] = self._rings[side].bit_count()
+
+    def hit_obstruction(self, center, piece_center):
+        """
+        Checks if a piece moved to center would cover a stone that is not part of the piece being moved
+        :param center: square the piece would be moved to
+        :param piece_center: square the piece started on
+        :return: True if an obstruction is hit, False otherwise
+        """
+        return self.get_occupied() & FOOTPRINT[center] & ~FOOTPRINT[piece_center] != 0
+
+    def piece_moves(self, center, side):
+        """
+        Calculates the squares the piece on center can move to. The piece moves in the direction of each of its
+        stones around the center, up to 3 squares or any distance when the center has a stone, and stops on the
+        first square where its footprint covers another stone. The center must stay in columns b-s and rows 2-19.
+        The squares come from RAYS, and only the leading edge of the footprint is checked at each step since the
+        squares behind it were already clear.
+        :param center: center square of the piece
+        :param side: BLACK or WHITE
+        :return: list of square indexes, in the order of DIRECTIONS
+        """
+        stones = self._stones[side]
+        occupied = stones | self._stones[1 - side]
+        rays = RAYS[center] if stones >> center & 1 else SHORT_RAYS[center]
+        moves = []
+        for k in range(8):
+            if not stones >> (center + DIRECTION_OFFSETS[k]) & 1:
+                continue
+            leading_edge = LEADING_EDGE[k]
+            for new_center in rays[k]:
+                moves.append(new_center)
+                if occupied & leading_edge[new_center]:
+                    break
+        return moves
+
+    def _has_ring_after(self, center, new_center, side):
+        """
+        Works out the side's stones after moving the piece on center to new_center, without changing the
+        Position, and checks for a ring on the center squares near either footprint
+        :param center: center square of the piece being moved
+        :param new_center: square the center is moved to
+        :param side: BLACK or WHITE
+        :return: True if the move leaves a ring near the piece, False otherwise
+        """
+        stones = self._stones[side]
+        piece = stones & FOOTPRINT[center]
+        distance = new_center - center
+        moved = piece << distance if distance >= 0 else piece >> -distance
+        new_stones = (stones & ~FOOTPRINT[center] & ~FOOTPRINT[new_center] | moved) & CENTER_MASK
+        empty = (AFFECTED[center] | AFFECTED[new_center]) & ~new_stones & \
+            ~(self._stones[1 - side] & ~FOOTPRINT[new_center])
+        return _all_neighbors(new_stones, empty) != 0
+
+    def keeps_ring(self, center, new_center, side):
+        """
+        Checks if the side still has a ring after moving the piece on center to new_center, without changing
+        the Position. Rings away from both footprints can't be touched by the move, so the new stones only
+        need to be worked out when every ring is near the piece.
+        :param center: center square of the piece being moved
+        :param new_center: square the center is moved to
+        :param side: BLACK or WHITE
+        :return: True if the side has at least one ring after the move, False otherwise
+        """
+        if self._rings[side] & ~(AFFECTED[center] | AFFECTED[new_center]):
+            return True
+        return self._has_ring_after(center, new_center, side)
+
+    def keeps_ring_moves(self, center, new_centers, side):
+        """
+        Same as keeps_ring for every move of one piece at once. The rings away from the piece's current footprint
+        are only looked up once, so most moves are decided with a single AND.
+        :param center: center square of the piece being moved
+        :param new_centers: squares the center can move to, e.g. from piece_moves
+        :param side: BLACK or WHITE
+        :return: list of the new_centers that leave the side with at least one ring
+        """
+        far_rings = self._rings[side] & ~AFFECTED[center]
+        return [new_center for new_center in new_centers
+                if far_rings & ~AFFECTED[new_center] or self._has_ring_after(center, new_center, side)]
+
+    def generate_moves(self, side):
+        """
+        Generator for every legal move of a side. The valid piece centers are found for the whole board at once,
+        and moves that would leave the side without a ring are skipped.
+        :param side: BLACK or WHITE
+        :return: yields (center, new_center) tuples of square indexes
+        """
+        centers = self.piece_centers(side)
+        while centers:
+            center = (centers & -centers).bit_length() - 1
+            centers &= centers - 1
+            for new_center in self.keeps_ring_moves(center, self.piece_moves(center, side), side):
+                yield center, new_center
+
+    def move_piece(self, center, new_center, side):
+        """
+        Moves the piece on center to new_center. Every stone under the new footprint is captured, and any stone
+        that ends up on the edge of the board is removed.
+        :param center: center square of the piece being moved
+        :param new_center: square the center is moved to
+        :param side: BLACK or WHITE
+        :return: tuple of the number of the side's stones removed and the number of opposing stones removed
+        """
+        stones = self._stones[side]
+        opposing = self._stones[1 - side]
+        piece = stones & FOOTPRINT[center]
+        distance = new_center - center
+        moved = piece << distance if distance >= 0 else piece >> -distance
+        new_stones = (stones & ~FOOTPRINT[center] & ~FOOTPRINT[new_center] | moved) & CENTER_MASK
+        new_opposing = opposing & ~FOOTPRINT[new_center] & CENTER_MASK
+        self._stones[side] = new_stones
+        self._stones[1 - side] = new_opposing
+        region = AFFECTED[center] | AFFECTED[new_center]
+        self._update_rings(region)
+        self._pieces_dirty = True
+        self._hash ^= self._hash_squares(side, stones ^ new_stones) ^ self._hash_squares(1 - side, opposing ^ new_opposing)
+        if self._side_to_move == side:
+            self._side_to_move = 1 - side
+            self._hash ^= ZOBRIST_WHITE_TO_MOVE
+        return stones.bit_count() - new_stones.bit_count(), opposing.bit_count() - new_opposing.bit_count()
+
+    def push_move(self, center, new_center, side):
+        """
+        Moves a piece like move_piece and saves what changed so the move can be taken back with pop_move.
+        Only the squares that changed are saved, as XOR masks of each side's stones and rings, along with the
+        hash and side to move from before the move.
+        :param center: center square of the piece being moved
+        :param new_center: square the center is moved to
+        :param side: BLACK or WHITE
+        :return: tuple of the number of the side's stones removed and the number of opposing stones removed
+        """
+        black_stones, white_stones = self._stones
+        black_rings, white_rings = self._rings
+        previous_hash = self._hash
+        previous_side = self._side_to_move
+        removed = self.move_piece(center, new_center, side)
+        ply = self._ply
+        if ply == len(self._undo_stones[BLACK]):
+            self._undo_stones[BLACK].append(0)
+            self._undo_stones[WHITE].append(0)
+            self._undo_rings[BLACK].append(0)
+            self._undo_rings[WHITE].append(0)
+            self._undo_hashes.append(0)
+            self._undo_sides.append(BLACK)
+        self._undo_stones[BLACK][ply] = black_stones ^ self._stones[BLACK]
+        self._undo_stones[WHITE][ply] = white_stones ^ self._stones[WHITE]
+        self._undo_rings[BLACK][ply] = black_rings ^ self._rings[BLACK]
+        self._undo_rings[WHITE][ply] = white_rings ^ self._rings[WHITE]
+        self._undo_hashes[ply] = previous_hash
+        self._undo_sides[ply] = previous_side
+        self._ply = ply + 1
+        return removed
+
+    def pop_move(self):
+        """
+        Takes back the last move made with push_move
+        :return: True if a move was taken back, False if there was no move to take back
+        """
+        if self._ply == 0:
+            return False
+        self._ply -= 1
+        ply = self._ply
+        for side in (BLACK, WHITE):
+            self._stones[side] ^= self._undo_stones[side][ply]
+            if self._undo_rings[side][ply]:
+                self._rings[side] ^= self._undo_rings[side][ply]
+                self._ring_counts[side] = self._rings[side].bit_count()
+        self._pieces_dirty = True
+        self._hash = self._undo_hashes[ply]
+        self._side_to_move = self._undo_sides[ply]
+        return True
+
+    def get_ply(self):
+        """
+        Getter method
+        :return: number of moves on the undo stack
+        """
+        return self._ply
+
+
+# the starting position with its rings and piece centers worked out, which every new Board copies
+_START_POSITION = Position(START_BLACK_STONES, START_WHITE_STONES)
+_START_POSITION._refresh_pieces()
+
 
 class GessGame:
     """
@@ -18,24 +699,38 @@ class GessGame:
     Keeps up with whose turn it is
     Player can resign
     Player can make a move
+    Moves can be pushed and popped for searching ahead
     Collaborators:
     Board
     Player
     """
 
-    def __init__(self):
+    __slots__ = ('_debug', '_board', 'player_1', 'player_2', '_current_player', '_opposing_player', '_game_state',
+                 '_undo_game_states', '_undo_own_removed', '_undo_opposing_removed', '_undo_own_rings',
+                 '_undo_opposing_rings', '_ply')
+
+    def __init__(self, debug=False):
         """
         Init method to initialize a game of Gess.
         Creates the board and the two players.
         Initializes the current_player, which starts as 'BLACK'.
         Initializes the game_state to 'UNFINISHED'.
+        :param debug: if True, the rings tracked by the board are checked against a full rescan after every move
         """
+        self._debug = debug
         self._board = Board()
         self.player_1 = Player('BLACK')  # black player
         self.player_2 = Player('WHITE')  # white player
         self._current_player = self.player_1
         self._opposing_player = self.player_2
         self._game_state = 'UNFINISHED'
+        # undo stack for push_move and pop_move, reused the same way as the one in Position
+        self._undo_game_states = []
+        self._undo_own_removed = []
+        self._undo_opposing_removed = []
+        self._undo_own_rings = []
+        self._undo_opposing_rings = []
+        self._ply = 0
 
     def get_board(self):
         """
@@ -88,27 +783,193 @@ class GessGame:
         Initiates moving a piece to a new location
         Updates state of is_players_turn in Player class
         Updates number of rings the player has
-        A piece must be chosen first
-        :param current_location:
-        :param new_location:
+        :param current_location: coordinate of the center of the piece, e.g. 'm3'
+        :param new_location: coordinate the center moves to, e.g. 'm6'
+        :return: True if the move was made, False if it isn't legal or the game is over
+        """
+        try:
+            center = square_index(current_location)
+            new_center = square_index(new_location)
+        except ValueError:
+            return False
+        return self.make_move_at(center, new_center)
+
+    def make_move_at(self, center, new_center):
+        """
+        Same as make_move, but takes square indexes. The piece at center is chosen first.
+        :param center: square index of the center of the piece
+        :param new_center: square index the center moves to
+        :return: True if the move was made, False if it isn't legal or the game is over
+        """
+        if self._game_state != 'UNFINISHED':
+            return False
+        if not self.choose_piece_at(center):
+            return False
+        # only the one move is checked for the ring, rather than listing every square with possible_squares
+        side = self._current_player.get_side()
+        position = self._board.get_position()
+        if new_center not in position.piece_moves(center, side) or not position.keeps_ring(center, new_center, side):
+            return False
+        self._board.move_piece_at(center, new_center, self._current_player, self._opposing_player)
+        self.update_game_state()
+        self.next_turn(self._current_player, self._opposing_player)
+        return True
+
+    def update_game_state(self):
+        """
+        Updates the number of rings of both players after a move by the current player, and if either player
+        is out of rings the current player wins. In debug mode the piece centers tracked by the board are
+        also checked against a full rescan.
         :return: none
         """
-        possible_moves = self._board.possible_moves(self._current_player)
-        if new_location in possible_moves:
-            current_location = current_location[0] + self._board.flip_numbers[current_location[1:]]
-            new_location = new_location[0] + self._board.flip_numbers[new_location[1:]]
-            self._board.move_piece(current_location, new_location, self._current_player, self._opposing_player)
-            self.identify_rings(self._current_player)
-            self.identify_rings(self._opposing_player)
-            # split this logic up so the correct player wins
-            if self._current_player.get_rings() == 0 or self._opposing_player.get_rings() == 0:
-                team = self._current_player.get_team()
-                self.set_game_state(team + "_WON")
-                print(self.get_game_state())
-            self.next_turn(self._current_player, self._opposing_player)
-            return True
-        else:
+        self.identify_rings(self._current_player)
+        self.identify_rings(self._opposing_player)
+        if self._debug:
+            position = self._board.get_position()
+            for player in (self._current_player, self._opposing_player):
+                if position.piece_centers(player.get_side()) != position.scan_piece_centers(player.get_side()):
+                    raise RuntimeError(player.get_team() + " piece centers are out of sync with the board")
+        # split this logic up so the correct player wins
+        if self._current_player.get_rings() == 0 or self._opposing_player.get_rings() == 0:
+            team = self._current_player.get_team()
+            self.set_game_state(team + "_WON")
+
+    def push_move(self, center, new_center):
+        """
+        Makes a move for the current player without checking it, saving what is needed to take it back with
+        pop_move. Meant for searching ahead, so a game doesn't have to be copied to try out a move.
+        The move should come from Board.generate_all_moves or Position.generate_moves.
+        :param center: square index of the center of the piece being moved
+        :param new_center: square index the center is moved to
+        :return: none
+        """
+        current_player = self._current_player
+        opposing_player = self._opposing_player
+        own_removed, opposing_removed = self._board.get_position().push_move(
+            center, new_center, current_player.get_side())
+        ply = self._ply
+        if ply == len(self._undo_game_states):
+            self._undo_game_states.append(None)
+            self._undo_own_removed.append(0)
+            self._undo_opposing_removed.append(0)
+            self._undo_own_rings.append(0)
+            self._undo_opposing_rings.append(0)
+        self._undo_game_states[ply] = self._game_state
+        self._undo_own_removed[ply] = own_removed
+        self._undo_opposing_removed[ply] = opposing_removed
+        self._undo_own_rings[ply] = current_player.get_rings()
+        self._undo_opposing_rings[ply] = opposing_player.get_rings()
+        self._ply = ply + 1
+        current_player.remove_stone(own_removed)
+        opposing_player.remove_stone(opposing_removed)
+        self.update_game_state()
+        self.next_turn(current_player, opposing_player)
+
+    def pop_move(self):
+        """
+        Takes back the last move made with push_move, restoring the board, both players, whose turn it is and
+        the state of the game
+        :return: True if a move was taken back, False if there was no move to take back
+        """
+        if self._ply == 0:
             return False
+        self._ply -= 1
+        ply = self._ply
+        self._board.get_position().pop_move()
+        self.next_turn(self._current_player, self._opposing_player)
+        self._current_player.remove_stone(-self._undo_own_removed[ply])
+        self._opposing_player.remove_stone(-self._undo_opposing_removed[ply])
+        self._current_player.set_rings(self._undo_own_rings[ply])
+        self._opposing_player.set_rings(self._undo_opposing_rings[ply])
+        self._game_state = self._undo_game_states[ply]
+        return True
+
+    def snapshot(self):
+        """
+        Captures the board, both players, whose turn it is and the state of the game in a tuple of ints and
+        strings, so a game can be saved and gone back to without copying it. The undo stack isn't included.
+        :return: tuple that can be given to restore any number of times, on this game or another
+        """
+        return (self._board.get_position().snapshot(), self._current_player.get_side(), self._game_state,
+                self.player_1.get_remaining_stones(), self.player_2.get_remaining_stones(),
+                self.player_1.get_rings(), self.player_2.get_rings())
+
+    def restore(self, snapshot):
+        """
+        Goes back to a snapshot. The current piece is forgotten and the undo stack is emptied.
+        :param snapshot: tuple from snapshot
+        :return: none
+        """
+        position, side, self._game_state, black_stones, white_stones, black_rings, white_rings = snapshot
+        self._board.restore(position)
+        self._set_players(side, black_stones, white_stones, black_rings, white_rings)
+
+    def _set_players(self, side, black_stones, white_stones, black_rings, white_rings):
+        """
+        Sets the counts of both players and whose turn it is, and empties the undo stack
+        :param side: BLACK or WHITE, the side whose turn it is
+        :param black_stones: remaining stones of the black player
+        :param white_stones: remaining stones of the white player
+        :param black_rings: rings of the black player
+        :param white_rings: rings of the white player
+        :return: none
+        """
+        self.player_1.set_remaining_stones(black_stones)
+        self.player_2.set_remaining_stones(white_stones)
+        self.player_1.set_rings(black_rings)
+        self.player_2.set_rings(white_rings)
+        if side == BLACK:
+            self._current_player, self._opposing_player = self.player_1, self.player_2
+        else:
+            self._current_player, self._opposing_player = self.player_2, self.player_1
+        self._ply = 0
+
+    def to_bytes(self):
+        """
+        Packs the game into a fixed-size buffer of GAME_BYTES.size bytes, e.g. to send it to another process.
+        The undo stack isn't included.
+        :return: bytes
+        """
+        position = self._board.get_position()
+        return GAME_BYTES.pack(GAME_BYTES_VERSION, position.get_stones(BLACK).to_bytes(50, 'little'),
+                               position.get_stones(WHITE).to_bytes(50, 'little'),
+                               self._current_player.get_side(), GAME_STATES.index(self._game_state),
+                               self.player_1.get_remaining_stones(), self.player_1.get_rings(),
+                               self.player_2.get_remaining_stones(), self.player_2.get_rings())
+
+    @classmethod
+    def from_bytes(cls, data, debug=False):
+        """
+        Unpacks a game packed by to_bytes
+        :param data: bytes-like object from to_bytes
+        :param debug: passed on to the new GessGame
+        :return: the new GessGame
+        """
+        version, black_stones, white_stones, side, state, black_remaining, black_rings, white_remaining, \
+            white_rings = GAME_BYTES.unpack(data)
+        if version != GAME_BYTES_VERSION:
+            raise ValueError("unknown game buffer version: {}".format(version))
+        game = cls(debug)
+        game._board.load(int.from_bytes(black_stones, 'little'), int.from_bytes(white_stones, 'little'), side)
+        game._game_state = GAME_STATES[state]
+        game._set_players(side, black_remaining, white_remaining, black_rings, white_rings)
+        return game
+
+    def load_position(self, black_stones, white_stones, side, game_state='UNFINISHED'):
+        """
+        Sets up the game with the given stones. Each player's remaining stones and rings are counted from the
+        board. The current piece is forgotten and the undo stack is emptied.
+        :param black_stones: bitboard of the black stones
+        :param white_stones: bitboard of the white stones
+        :param side: BLACK or WHITE, the side whose turn it is
+        :param game_state: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+        :return: none
+        """
+        self._board.load(black_stones, white_stones, side)
+        position = self._board.get_position()
+        self._game_state = game_state
+        self._set_players(side, position.get_stones(BLACK).bit_count(), position.get_stones(WHITE).bit_count(),
+                          position.get_ring_count(BLACK), position.get_ring_count(WHITE))
 
     def choose_piece(self, center_square):
         """
@@ -117,9 +978,20 @@ class GessGame:
         :param center_square: coordinate chosen to be the center_square of the piece
         :return: True if it is a valid piece, False otherwise
         """
-        center_square = center_square[0] + self._board.flip_numbers[center_square[1:]]
-        if self._board.is_a_piece(center_square, self._current_player):
-            self._board.make_piece(center_square)
+        try:
+            center = square_index(center_square)
+        except ValueError:
+            return False
+        return self.choose_piece_at(center)
+
+    def choose_piece_at(self, center):
+        """
+        Same as choose_piece, but takes a square index
+        :param center: square index chosen to be the center of the piece
+        :return: True if it is a valid piece, False otherwise
+        """
+        if self._board.is_a_piece_at(center, self._current_player):
+            self._board.make_piece_at(center)
             return True
         else:
             return False
@@ -137,29 +1009,14 @@ class GessGame:
         Finds all of the players current rings, and if a player's number of rings goes to zero then the game is
         notified so that the game state can change to show the other player won.
         :return: none
-        algorithm: iterate through each square, check if the square is_a_piece
-        if it is a piece, make a temporary Piece object
-        check each direction of the piece to see if it is a ring
-        """
-        stone = player.get_stone()
-        num_of_rings = 0
-        is_a_ring = None
-        for num in range(0, 20):
-            for char in range(ord('b'), ord('t')):
-                coordinate = chr(char) + str(num)
-                if self._board.is_a_piece(coordinate, player):
-                    self._board.make_piece(coordinate)
-                    # check if center square is empty
-                    if self._board.get_current_piece().get_center_square_value() == ' ':
-                        # check every direction for a stone
-                        for direction in self._board.get_current_piece().footprint_values:
-                            if direction != 'center' and self._board.get_current_piece().footprint_values[direction] == stone:
-                                is_a_ring = True
-                            elif direction != 'center':
-                                is_a_ring = False
-                                break
-                        if is_a_ring is True:
-                            num_of_rings += 1
+        algorithm: the Position keeps a live set of ring centers for each side and only rechecks the centers whose
+        3x3 window overlaps the old or new footprint of a move, so this just reads the count.
+        In debug mode the live set is compared against a full rescan of the board.
+        """
+        position = self._board.get_position()
+        if self._debug and position.get_rings(player.get_side()) != position.scan_rings(player.get_side()):
+            raise RuntimeError(player.get_team() + " rings are out of sync with the board")
+        num_of_rings = position.get_ring_count(player.get_side())
         player.set_rings(num_of_rings)
 
 
@@ -176,61 +1033,70 @@ class Board:
     Can move a piece
     Prints out game board
     Collaborators:
+    Position
     Piece
     """
 
+    # the coordinate tables are shared by every Board, see ALPHA_TO_INDEX
+    alpha_to_index = ALPHA_TO_INDEX
+    index_to_alpha = INDEX_TO_ALPHA
+    flip_numbers = FLIP_NUMBERS
+    out_of_bounds_columns = OUT_OF_BOUNDS_COLUMNS
+    out_of_bounds_rows = OUT_OF_BOUNDS_ROWS
+
+    __slots__ = ('_position', '_current_piece', '_piece')
+
     def __init__(self):
         """
-        Init method to initialize a Board object. Creates the game board and dictionaries for converting letter
-        coordinates to numbers and vice/versa, and converting board numbers to array indexes. Also initializes the
+        Init method to initialize a Board object. Copies the prebuilt starting position and initializes the
         current piece to None.
         """
-        self.alpha_to_index = {}
-        index = 0
-        for i in range(ord('a'), ord('t') + 1):
-            self.alpha_to_index[chr(i)] = index
-            index += 1
-        self.index_to_alpha = {}
-        index = 0
-        for i in range(ord('a'), ord('t') + 1):
-            self.index_to_alpha[index] = chr(i)
-            index += 1
-        self.flip_numbers = {}
-        num = 20
-        for i in range(0, 21):
-            self.flip_numbers[str(i)] = str(num)
-            num -= 1
-        self._gess_board = [[' ' for i in range(21)] for i in range(21)]
-        row_2_4_17_and_19 = 'ceghijklmnpr'
-        for letter in row_2_4_17_and_19:
-            self._gess_board[1][self.alpha_to_index[letter]] = 'w'
-            self._gess_board[3][self.alpha_to_index[letter]] = 'w'
-            self._gess_board[16][self.alpha_to_index[letter]] = 'b'
-            self._gess_board[18][self.alpha_to_index[letter]] = 'b'
-        row_3_and_18 = 'bcdfhijkmoqrs'
-        for letter in row_3_and_18:
-            self._gess_board[2][self.alpha_to_index[letter]] = 'w'
-            self._gess_board[17][self.alpha_to_index[letter]] = 'b'
-        row_7_and_14 = 'cfilor'
-        for letter in row_7_and_14:
-            self._gess_board[6][self.alpha_to_index[letter]] = 'w'
-            self._gess_board[13][self.alpha_to_index[letter]] = 'b'
-        row_20 = 'abcdefghijklmnopqrst'
-        for letter in row_20:
-            self._gess_board[20][self.alpha_to_index[letter]] = letter
-        for row in range(20):
-            self._gess_board[row][20] = str(20 - row)
+        self._position = _START_POSITION.copy()
+        self._current_piece = None
+        self._piece = Piece(0, self._position)  # the only Piece of the board, moved to each center chosen
+
+    def get_position(self):
+        """
+        Getter method
+        :return: the Position holding the stones
+        """
+        return self._position
+
+    def restore(self, snapshot):
+        """
+        Goes back to a snapshot of the Position and forgets the current piece
+        :param snapshot: tuple from Position.snapshot
+        :return: none
+        """
+        self._position.restore(snapshot)
+        self._current_piece = None
 
+    def load(self, black_stones, white_stones, side_to_move):
+        """
+        Replaces every stone on the board and forgets the current piece
+        :param black_stones: bitboard of the black stones
+        :param white_stones: bitboard of the white stones
+        :param side_to_move: BLACK or WHITE
+        :return: none
+        """
+        self._position.load(black_stones, white_stones, side_to_move)
         self._current_piece = None
-        self.out_of_bounds_columns = ['a', 't']
-        self.out_of_bounds_rows = ['0', '19']
 
     def get_gess_board(self):
         """
-        Getter method
+        Builds the gess board in its current state as a list of rows, without the row and column labels
         :return: the gess board in its current state
         """
-        return self._gess_board
+        black_stones = self._position.get_stones(BLACK)
+        white_stones = self._position.get_stones(WHITE)
+        gess_board = [[' '] * BOARD_SIZE for row in range(BOARD_SIZE)]
+        for row in range(BOARD_SIZE):
+            for column in range(BOARD_SIZE):
+                if black_stones >> (row * BOARD_SIZE + column) & 1:
+                    gess_board[row][column] = 'b'
+                elif white_stones >> (row * BOARD_SIZE + column) & 1:
+                    gess_board[row][column] = 'w'
+        return gess_board
 
     def get_current_piece(self):
         """
@@ -239,19 +1105,45 @@ class Board:
         """
         return self._current_piece
 
+    def get_square(self, coordinate):
+        """
+        Converts a coordinate to its square index in the Position
+        :param coordinate: coordinate using the board's row numbers, e.g. 'g15' for g5
+        :return: square index
+        """
+        return int(coordinate[1:]) * BOARD_SIZE + self.alpha_to_index[coordinate[0]]
+
+    def get_coordinate(self, square):
+        """
+        Converts a square index to the coordinate shown to the players
+        :param square: square index
+        :return: coordinate such as 'g5'
+        """
+        return SQUARE_NAMES[square]
+
     def update_board(self, coordinate, value):
         """
         Method to update the gess_board.
         :param coordinate:
         :return: none
         """
-        column = self.alpha_to_index[coordinate[0]]
-        row = int(coordinate[1:])
+        self.set_square(self.get_square(coordinate), value)
 
-        if self.out_of_bounds(coordinate):
-            self._gess_board[row][column] = ' '
-        else:
-            self._gess_board[row][column] = value
+    def set_square(self, square, value):
+        """
+        Puts a stone on a square or empties it
+        :param square: square index
+        :param value: 'b', 'w' or ' '
+        :return: none
+        """
+        black_stones = self._position.get_stones(BLACK) & ~(1 << square)
+        white_stones = self._position.get_stones(WHITE) & ~(1 << square)
+        if value == 'b':
+            black_stones |= 1 << square
+        elif value == 'w':
+            white_stones |= 1 << square
+        self._position.set_stones(BLACK, black_stones)
+        self._position.set_stones(WHITE, white_stones)
 
     def is_a_piece(self, center_square, current_player):
         """
@@ -260,32 +1152,24 @@ class Board:
         :param current_player: the current player
         :return: boolean to tell whether it is a valid piece
         """
-        try:
-            north = self._gess_board[int(center_square[1:]) - 1][self.alpha_to_index[center_square[0]]]
-            north_west = self._gess_board[int(center_square[1:]) - 1][self.alpha_to_index[center_square[0]] - 1]
-            north_east = self._gess_board[int(center_square[1:]) - 1][self.alpha_to_index[center_square[0]] + 1]
-            west = self._gess_board[int(center_square[1:])][self.alpha_to_index[center_square[0]] - 1]
-            east = self._gess_board[int(center_square[1:])][self.alpha_to_index[center_square[0]] + 1]
-            south = self._gess_board[int(center_square[1:]) + 1][self.alpha_to_index[center_square[0]]]
-            south_west = self._gess_board[int(center_square[1:]) + 1][self.alpha_to_index[center_square[0]] - 1]
-            south_east = self._gess_board[int(center_square[1:]) + 1][self.alpha_to_index[center_square[0]] + 1]
-        except IndexError:
-            return False
-        footprint = [north, north_west, north_east, west, east, south, south_west, south_east]
-        stone = current_player.get_stone()
-        opposing_stone = current_player.get_opposing_stone()
-        stones_in_piece = 0
         if self.out_of_bounds(center_square):
             return False
-        for direction in footprint:
-            if direction == opposing_stone:
-                return False
-            elif direction == stone:
-                stones_in_piece += 1
-        if stones_in_piece > 0:
-            return True
-        else:
+        try:
+            center = self.get_square(center_square)
+        except (KeyError, ValueError):
             return False
+        return self.is_a_piece_at(center, current_player)
+
+    def is_a_piece_at(self, center, current_player):
+        """
+        Same as is_a_piece, but takes a square index
+        :param center: square index of the center chosen for the piece
+        :param current_player: the current player
+        :return: boolean to tell whether it is a valid piece
+        """
+        if self.out_of_bounds_at(center):
+            return False
+        return self._position.is_a_piece(center, current_player.get_side())
 
     def out_of_bounds(self, coordinate):
         """
@@ -298,80 +1182,84 @@ class Board:
         else:
             return False
 
+    def out_of_bounds_at(self, square):
+        """
+        Same as out_of_bounds, but takes a square index. Only columns b-s and rows 2-19 are in bounds.
+        :param square: square index
+        :return: True if the square is out of bounds, False otherwise.
+        """
+        return not (square >= 0 and CENTER_MASK >> square & 1)
+
     def make_piece(self, center_square):
         """
-        Creates a piece for the current turn
+        Makes the piece at a center the current piece for the turn, moving the board's Piece there
         :param center_square: coordinate of the center square of the piece
         :return: none
         """
-        self._current_piece = Piece(center_square, self._gess_board, self.alpha_to_index, self.index_to_alpha)
+        self.make_piece_at(self.get_square(center_square))
+
+    def make_piece_at(self, center):
+        """
+        Same as make_piece, but takes a square index
+        :param center: square index of the center square of the piece
+        :return: none
+        """
+        self._piece.set_center(center)
+        self._current_piece = self._piece
 
     def hit_obstruction(self, coordinate, current_player):
         """
         Checks if an obstruction will be encountered, where an obstruction is a stone of either player
         :return: True if an obstruction is hit, False otherwise
         """
-        temp_piece = Piece(coordinate, self._gess_board, self.alpha_to_index, self.index_to_alpha)
-        for square in temp_piece.footprint_values:
-            # if not part of current piece, check the square
-            if temp_piece.footprint_coordinates[square] not in self._current_piece.footprint_coordinates.values():
-                if temp_piece.footprint_values[square] == current_player.get_stone() or\
-                        temp_piece.footprint_values[square] == current_player.get_opposing_stone():
-                    return True
-        return False
+        piece_center = self._current_piece.get_center()
+        return self._position.hit_obstruction(self.get_square(coordinate), piece_center)
 
     def possible_moves(self, current_player):
         """
-        Calculates the possible moves for the chosen piece
+        Calculates the possible moves for the chosen piece. Moves that would leave the player without a ring
+        are left out.
         :param current_player: the current player
         :return: list of coordinates for possible moves
         """
-        stone = current_player.get_stone()
-        opposing_stone = current_player.get_opposing_stone()
-        possible_moves = []
-        if self._current_piece.get_center_square_value() == stone:
-            # piece can move as far as possible in any direction, but not including the center stone
-            # movement is determined by stones not on center square
-            for square in self._current_piece.footprint_values:
-                if square != 'center' and self._current_piece.footprint_values[square] == stone:
-                    for i in range(1, 20):
-                        coordinate = self._current_piece.add_to_direction_coordinates(i, square)
-                        if self.out_of_bounds(coordinate) is False:
-                            coordinate = self._current_piece.add_to_direction_coordinates(i - 1, square)
-                            # check each side for obstruction
-                            if self.hit_obstruction(coordinate, current_player):
-                                coordinate = coordinate[0] + self.flip_numbers[str(int(coordinate[1:]))]
-                                possible_moves.append(coordinate)
-                                break
-                            else:
-                                coordinate = coordinate[0] + self.flip_numbers[str(int(coordinate[1:]))]
-                                possible_moves.append(coordinate)
-                        else:
-                            coordinate = self._current_piece.add_to_direction_coordinates(i - 1, square)
-                            coordinate = coordinate[0] + self.flip_numbers[str(int(coordinate[1:]))]
-                            possible_moves.append(coordinate)
-                            break
-        else:
-            for square in self._current_piece.footprint_values: # returns keys which are strings 'north', etc.
-                if square != 'center' and self._current_piece.footprint_values[square] == stone:
-                    for i in range(1, 4):
-                        coordinate = self._current_piece.add_to_direction_coordinates(i, square)
-                        if self.out_of_bounds(coordinate) is False:
-                            coordinate = self._current_piece.add_to_direction_coordinates(i - 1, square)
-                            # check each side for obstruction
-                            if self.hit_obstruction(coordinate, current_player):
-                                coordinate = coordinate[0] + self.flip_numbers[str(int(coordinate[1:]))]
-                                possible_moves.append(coordinate)
-                                break
-                            else:
-                                coordinate = coordinate[0] + self.flip_numbers[str(int(coordinate[1:]))]
-                                possible_moves.append(coordinate)
-                        else:
-                            coordinate = self._current_piece.add_to_direction_coordinates(i - 1, square)
-                            coordinate = coordinate[0] + self.flip_numbers[str(int(coordinate[1:]))]
-                            possible_moves.append(coordinate)
-                            break
-        return possible_moves
+        return [SQUARE_NAMES[square] for square in self.possible_squares(current_player)]
+
+    def possible_squares(self, current_player):
+        """
+        Same as possible_moves, but gives square indexes
+        :param current_player: the current player
+        :return: list of square indexes the chosen piece can move to
+        """
+        center = self._current_piece.get_center()
+        side = current_player.get_side()
+        return self._position.keeps_ring_moves(center, self._position.piece_moves(center, side), side)
+
+    def selectable_squares(self, player):
+        """
+        Lists every square a player can choose as the center of a piece, read from the centers the Position
+        keeps up to date
+        :param player: the player
+        :return: list of square indexes, lowest first
+        """
+        return bitboard_squares(self._position.piece_centers(player.get_side()))
+
+    def selectable_pieces(self, player):
+        """
+        Same as selectable_squares, but gives coordinates, e.g. for highlighting every piece a player can choose
+        :param player: the player
+        :return: list of coordinates such as 'g5'
+        """
+        return [SQUARE_NAMES[square] for square in self.selectable_squares(player)]
+
+    def generate_all_moves(self, player):
+        """
+        Generator for every legal move of a player, without needing to choose a piece first. Moves that would
+        leave the player without a ring are left out.
+        :param player: the player whose moves are generated
+        :return: yields (center, destination) tuples of coordinates in the form make_move takes, e.g. ('m3', 'm6')
+        """
+        for center, new_center in self._position.generate_moves(player.get_side()):
+            yield SQUARE_NAMES[center], SQUARE_NAMES[new_center]
 
     def move_piece(self, current_location, new_location, current_player, opposing_player):
         """
@@ -382,99 +1270,140 @@ class Board:
         :param opposing_player: The opposite player
         :return: none
         """
-        stone = current_player.get_stone()
-        opposing_stone = current_player.get_opposing_stone()
-
-        # piece is captured if in footprint
-        old_piece = self._current_piece
-        self.make_piece(new_location)
-        new_piece = self._current_piece
-        for square in new_piece.footprint_values:
-            if new_piece.footprint_coordinates[square] not in old_piece.footprint_coordinates.values():
-                if new_piece.footprint_values[square] == stone:
-                    current_player.remove_stone()
-            if new_piece.footprint_values[square] == opposing_stone:
-                opposing_player.remove_stone()
-            # add new piece to board
-            self.update_board(new_piece.footprint_coordinates[square], old_piece.footprint_values[square])
-            # delete old piece
-            if old_piece.footprint_coordinates[square] not in new_piece.footprint_coordinates.values():
-                self.update_board(old_piece.footprint_coordinates[square], ' ')
+        self.move_piece_at(self.get_square(current_location), self.get_square(new_location), current_player,
+                           opposing_player)
+
+    def move_piece_at(self, center, new_center, current_player, opposing_player):
+        """
+        Same as move_piece, but takes square indexes
+        :param center: square index of the center of the piece being moved
+        :param new_center: square index the center is moved to
+        :param current_player: The player who is making the move
+        :param opposing_player: The opposite player
+        :return: none
+        """
+        own_removed, opposing_removed = self._position.move_piece(center, new_center, current_player.get_side())
+        current_player.remove_stone(own_removed)
+        opposing_player.remove_stone(opposing_removed)
+        self.make_piece_at(new_center)
 
     def print_board(self):
         """
         Prints out the board in its current state
         :return: none
         """
-        for b in range(len(self._gess_board)):
-            print(self._gess_board[b])
+        gess_board = self.get_gess_board()
+        for row in range(BOARD_SIZE):
+            print(gess_board[row] + [ROW_LABELS[row]])
+        print(list(COLUMN_LABELS) + [' '])
 
 
 class Piece:
     """
-    Class to represent a piece on the board that is chosen by the player each turn
+    Class to represent a piece on the board that is chosen by the player each turn. A Piece is a view of the
+    3x3 window around one center square, so the board keeps a single Piece and moves it to whichever center is
+    chosen. Its values are read from the board's Position when they are asked for.
     Responsibilities:
     Has directions for the piece's footprint
     Is on the game board
     Collaborators:
-    A board object is passed when the Piece is created
+    Position
     """
 
-    def __init__(self, center_square, board, alpha_to_index, index_to_alpha):
+    __slots__ = ('_center', '_position')
+
+    def __init__(self, center, position):
         """
         Init method to initialize a Piece object
-        :param center_square: coordinate of the center square
-        :param board: board object of the current game
-        """
-        self._board = board
-        self._alpha_to_index = alpha_to_index
-        self._index_to_alpha = index_to_alpha
-        self._center_square = center_square
-        self._center_square_value = self._board[int(center_square[1:])][alpha_to_index[center_square[0]]]
-        self.footprint_coordinates = {  # column, row
-            'center': self._center_square,
-            'north': self._center_square[0] + str((int(self._center_square[1:]) - 1)),
-            'north_west': self._index_to_alpha[self._alpha_to_index[self._center_square[0]] - 1] + str(
-                (int(self._center_square[1:]) - 1)),
-            'north_east': self._index_to_alpha[self._alpha_to_index[self._center_square[0]] + 1] + str(
-                (int(self._center_square[1:]) - 1)),
-            'west': self._index_to_alpha[self._alpha_to_index[self._center_square[0]] - 1] + self._center_square[1:],
-            'east': self._index_to_alpha[self._alpha_to_index[self._center_square[0]] + 1] + self._center_square[1:],
-            'south': self._center_square[0] + str((int(self._center_square[1:]) + 1)),
-            'south_west': self._index_to_alpha[self._alpha_to_index[self._center_square[0]] - 1] + str(
-                (int(self._center_square[1:]) + 1)),
-            'south_east': self._index_to_alpha[self._alpha_to_index[self._center_square[0]] + 1] +
-                          str((int(self._center_square[1:]) + 1)),
-        }
-        self.footprint_values = {  # row, column
-            'center': self._center_square_value,
-            'north': self._board[int(self._center_square[1:]) - 1][self._alpha_to_index[self._center_square[0]]],
-            'north_west': self._board[int(self._center_square[1:]) - 1][
-                self._alpha_to_index[self._center_square[0]] - 1],
-            'north_east': self._board[int(self._center_square[1:]) - 1][
-                self._alpha_to_index[self._center_square[0]] + 1],
-            'west': self._board[int(self._center_square[1:])][self._alpha_to_index[self._center_square[0]] - 1],
-            'east': self._board[int(self._center_square[1:])][self._alpha_to_index[self._center_square[0]] + 1],
-            'south': self._board[int(self._center_square[1:]) + 1][self._alpha_to_index[self._center_square[0]]],
-            'south_west': self._board[int(self._center_square[1:]) + 1][
-                self._alpha_to_index[self._center_square[0]] - 1],
-            'south_east': self._board[int(self._center_square[1:]) + 1][
-                self._alpha_to_index[self._center_square[0]] + 1]
-        }
+        :param center: square index of the center square
+        :param position: Position of the current game
+        """
+        self._center = center
+        self._position = position
+
+    def get_center(self):
+        """
+        Getter method
+        :return: square index of the center square of the Piece
+        """
+        return self._center
+
+    def set_center(self, center):
+        """
+        Setter method that moves the Piece to another center
+        :param center: square index of the center square
+        :return: none
+        """
+        self._center = center
 
     def get_center_square(self):
         """
         Getter method
-        :return: coordinate of the center square of the Piece
+        :return: coordinate of the center square of the Piece, using the board's row numbers
         """
-        return self._center_square
+        return _internal_coordinate(self._center)
 
     def get_center_square_value(self):
         """
         Getter method
         :return: value at the center square of the Piece
         """
-        return self._center_square_value
+        return _square_value(self._position, self._center)
+
+    def get_value(self, index):
+        """
+        Gets the value of one square of the footprint
+        :param index: 0 for the center, 1 to 8 for the directions in the order of FOOTPRINT_NAMES
+        :return: 'b', 'w' or ' '
+        """
+        return _square_value(self._position, FOOTPRINT_SQUARES[self._center][index])
+
+    def covers(self, square):
+        """
+        Checks if a square is part of the piece's footprint
+        :param square: square index
+        :return: True if the square is in the 3x3 window, False otherwise
+        """
+        return FOOTPRINT[self._center] >> square & 1 == 1
+
+    def get_stones(self, side):
+        """
+        Gets one side's stones inside the footprint
+        :param side: BLACK or WHITE
+        :return: bitboard of the stones
+        """
+        return self._position.get_stones(side) & FOOTPRINT[self._center]
+
+    @property
+    def footprint_coordinates(self):
+        """
+        Coordinates of the footprint, using the board's row numbers
+        :return: dict of direction name -> coordinate
+        """
+        return {name: _internal_coordinate(square)
+                for name, square in zip(FOOTPRINT_NAMES, FOOTPRINT_SQUARES[self._center])}
+
+    @property
+    def footprint_values(self):
+        """
+        Values of the footprint
+        :return: dict of direction name -> 'b', 'w' or ' '
+        """
+        return {name: _square_value(self._position, square)
+                for name, square in zip(FOOTPRINT_NAMES, FOOTPRINT_SQUARES[self._center])}
+
+    def _square_in_direction(self, amount, direction):
+        """
+        Finds the row and column of the square a given amount past the footprint in a direction
+        :param amount: number of squares past the footprint
+        :param direction: name of the direction
+        :return: tuple of row and column, which can be off the board, or None for an invalid direction
+        """
+        if direction not in FOOTPRINT_NAMES[1:]:
+            return None
+        row, column = divmod(self._center, BOARD_SIZE)
+        row_step, column_step = DIRECTIONS[FOOTPRINT_NAMES.index(direction) - 1]
+        return row + row_step * (1 + amount), column + column_step * (1 + amount)
 
     def add_to_direction_coordinates(self, amount, direction):
         """
@@ -484,64 +1413,28 @@ class Piece:
         :param direction: direction to be added in
         :return: the coordinate of the square being referenced
         """
-        if direction == 'north':
-            return self._center_square[0] + str((int(self._center_square[1:]) - 1 - amount))
-        elif direction == 'north_west':
-            return self._index_to_alpha[self._alpha_to_index[self._center_square[0]] - 1 - amount] + str(
-                (int(self._center_square[1:]) - 1 - amount))
-        elif direction == 'north_east':
-            return self._index_to_alpha[self._alpha_to_index[self._center_square[0]] + 1 + amount] + str(
-                (int(self._center_square[1:]) - 1 - amount))
-        elif direction == 'west':
-            return self._index_to_alpha[
-                       self._alpha_to_index[self._center_square[0]] - 1 - amount] + self._center_square[1:]
-        elif direction == 'east':
-            return self._index_to_alpha[
-                       self._alpha_to_index[self._center_square[0]] + 1 + amount] + self._center_square[1:]
-        elif direction == 'south':
-            return self._center_square[0] + str((int(self._center_square[1:]) + 1 + amount))
-        elif direction == 'south_west':
-            return self._index_to_alpha[self._alpha_to_index[self._center_square[0]] - 1 - amount] + str(
-                (int(self._center_square[1:]) + 1 + amount))
-        elif direction == 'south_east':
-            return self._index_to_alpha[self._alpha_to_index[self._center_square[0]] + 1 + amount] + str(
-                (int(self._center_square[1:]) + 1 + amount))
-        else:
+        square = self._square_in_direction(amount, direction)
+        if square is None:
             print("Invalid direction")
+            return None
+        row, column = square
+        return chr(ord('a') + column) + str(row)
 
     def add_to_direction_values(self, amount, direction):
         """
         Method adds a given amount to the coordinates of the specified direction and returns the value at that square
         :param amount: number to be added to the given direction
         :param direction: direction to be added in
-        :return: the value at the square being referenced
-        """
-        if direction == 'north':
-            return self._board[int(self._center_square[1:]) - 1 - amount][
-                self._alpha_to_index[self._center_square[0]]]
-        elif direction == 'north_west':
-            return self._board[int(self._center_square[1:]) - 1 - amount][
-                self._alpha_to_index[self._center_square[0]] - 1 - amount]
-        elif direction == 'north_east':
-            return self._board[int(self._center_square[1:]) - 1 - amount][
-                self._alpha_to_index[self._center_square[0]] + 1 + amount]
-        elif direction == 'west':
-            return self._board[int(self._center_square[1:])][
-                self._alpha_to_index[self._center_square[0]] - 1 - amount]
-        elif direction == 'east':
-            return self._board[int(self._center_square[1:])][
-                self._alpha_to_index[self._center_square[0]] + 1 + amount]
-        elif direction == 'south':
-            return self._board[int(self._center_square[1:]) + 1 + amount][
-                self._alpha_to_index[self._center_square[0]]]
-        elif direction == 'south_west':
-            return self._board[int(self._center_square[1:]) + 1 + amount][
-                self._alpha_to_index[self._center_square[0]] - 1 - amount]
-        elif direction == 'south_east':
-            return self._board[int(self._center_square[1:]) + 1 + amount][
-                self._alpha_to_index[self._center_square[0]] + 1 + amount]
-        else:
+        :return: the value at the square being referenced, ' ' off the board
+        """
+        square = self._square_in_direction(amount, direction)
+        if square is None:
             print("Invalid direction")
+            return None
+        row, column = square
+        if not (0 <= row < BOARD_SIZE and 0 <= column < BOARD_SIZE):
+            return ' '
+        return _square_value(self._position, row * BOARD_SIZE + column)
 
 
 class Player:
@@ -557,6 +1450,8 @@ class Player:
     none
     """
 
+    __slots__ = ('_team', '_stone', '_opposing_stone', '_side', '_remaining_stones', '_rings')
+
     def __init__(self, team):
         """
         Init method to initialize a Player object.
@@ -566,9 +1461,11 @@ class Player:
         if self._team == 'BLACK':
             self._stone = 'b'
             self._opposing_stone = 'w'
+            self._side = BLACK
         if self._team == 'WHITE':
             self._stone = 'w'
             self._opposing_stone = 'b'
+            self._side = WHITE
         self._remaining_stones = 43
         self._rings = 1
 
@@ -585,21 +1482,32 @@ class Player:
     def get_opposing_stone(self):
         return self._opposing_stone
 
+    def get_side(self):
+        """
+        Gets the index of the player's stones in the board's Position
+        :return: BLACK or WHITE
+        """
+        return self._side
+
     def get_remaining_stones(self):
         return self._remaining_stones
 
+    def set_remaining_stones(self, remaining_stones):
+        self._remaining_stones = remaining_stones
+
     def set_rings(self, num_of_rings):
         self._rings = num_of_rings
 
     def get_rings(self):
         return self._rings
 
-    def remove_stone(self):
+    def remove_stone(self, number=1):
         """
         Decrements remaining_stones when a stone is captured
+        :param number: how many stones were captured, negative to put stones back when a move is taken back
         :return: none
         """
-        self._remaining_stones -= 1
+        self._remaining_stones -= number
 
 
 def main():
@@ -631,7 +1539,138 @@ def main():
             print("Possible moves: ", possible_moves)
             move = input("Please choose where to move your piece: ")
         gess_game.make_move(current_square, move)
+        if gess_game.get_game_state() != 'UNFINISHED':
+            print(gess_game.get_game_state())
+
+
+def read_games(lines):
+    """
+    Splits a stream of moves into games without reading more than one game at a time. Each move is written on its
+    own line as 'center destination', e.g. 'm3 m6', and games are separated by one or more blank lines. Lines
+    starting with '#' are skipped.
+    :param lines: iterable of lines, e.g. an open file
+    :return: generator of lists of (line number, center, destination) tuples, one list per game
+    """
+    moves = []
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields:
+            if moves:
+                yield moves
+                moves = []
+            continue
+        if fields[0].startswith('#'):
+            continue
+        if len(fields) == 2:
+            moves.append((number, fields[0], fields[1]))
+        else:
+            moves.append((number, line.strip(), ''))  # never a legal move, so it is reported as illegal
+    if moves:
+        yield moves
+
+
+def adjudicate_games(games):
+    """
+    Plays through games, stopping each at its first illegal move. One GessGame is reused for every game.
+    :param games: iterable of games from read_games
+    :return: generator of (game state, number of moves made, first illegal move) tuples, one per game, where the
+             illegal move is a (line number, move) tuple or None
+    """
+    gess_game = GessGame()
+    start = gess_game.snapshot()
+    for moves in games:
+        gess_game.restore(start)
+        plies = 0
+        illegal = None
+        for number, center, destination in moves:
+            if not gess_game.make_move(center, destination):
+                illegal = (number, (center + ' ' + destination).strip())
+                break
+            plies += 1
+        yield gess_game.get_game_state(), plies, illegal
+
+
+def adjudicate_file(path):
+    """
+    Adjudicates every game in a move list file, one at a time. A file that can't be opened or read gives an error
+    line in place of the games it has left, so the other files still get adjudicated.
+    :param path: path of the file
+    :return: generator of output lines, one per game: file, game number, game state, moves made and the first
+             illegal move or '-', separated by tabs. An error line is the file, '-', 'ERROR', '-' and the reason.
+    """
+    try:
+        with open(path) as move_file:
+            for game_number, (state, plies, illegal) in enumerate(adjudicate_games(read_games(move_file)), 1):
+                if illegal is None:
+                    illegal_text = '-'
+                else:
+                    illegal_text = "line {}: {}".format(*illegal)
+                yield "{}\t{}\t{}\t{}\t{}\n".format(path, game_number, state, plies, illegal_text)
+    except (OSError, UnicodeDecodeError) as error:
+        yield "{}\t-\tERROR\t-\t{}\n".format(path, getattr(error, 'strerror', None) or error)
+
+
+def _tally(line, counts):
+    """
+    Adds an output line of adjudicate_file to the summary counts
+    :param line: the line
+    :param counts: dict of games, illegal games and file errors, updated in place
+    :return: none
+    """
+    state, plies, illegal_text = line.rsplit('\t', 3)[1:]
+    if state == 'ERROR':
+        counts['errors'] += 1
+    else:
+        counts['games'] += 1
+        counts['illegal'] += illegal_text != '-\n'
+
+
+def _adjudicate_path(path):
+    """
+    Adjudicates a whole file in a worker process
+    :param path: path of the file
+    :return: list of the output lines of adjudicate_file
+    """
+    return list(adjudicate_file(path))
+
+
+def adjudicate(argv=None):
+    """
+    Headless entry point that re-checks move list files against the rules and writes one line per game to
+    standard output, with a summary on standard error. Nothing is asked for and no board is printed.
+    Usage: python GessGame.py adjudicate FILE [FILE ...] [--workers N]
+    :param argv: command line arguments after 'adjudicate', sys.argv if None
+    :return: none
+    """
+    parser = argparse.ArgumentParser(prog='GessGame.py adjudicate', description="Adjudicate Gess move list files")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes to spread the files across; with more than 1, the lines of each file are "
+                             "written once the whole file is done")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    counts = {'games': 0, 'illegal': 0, 'errors': 0}
+    write = sys.stdout.write
+    if args.workers > 1 and len(args.files) > 1:
+        from multiprocessing import Pool
+        with Pool(min(args.workers, len(args.files))) as pool:
+            for lines in pool.imap(_adjudicate_path, args.files):
+                for line in lines:
+                    write(line)
+                    _tally(line, counts)
+    else:
+        for path in args.files:
+            for line in adjudicate_file(path):
+                write(line)
+                _tally(line, counts)
+    elapsed = time.perf_counter() - start
+    print("{} games, {} with an illegal move, {} files not read, {:.2f} s, {:.0f} games/s".format(
+        counts['games'], counts['illegal'], counts['errors'], elapsed, counts['games'] / elapsed if elapsed else 0.0),
+        file=sys.stderr)
 
 
 if __name__ == '__main__':
-    main()
+    if sys.argv[1:2] == ['adjudicate']:
+        adjudicate(sys.argv[2:])
+    else:
+        main()
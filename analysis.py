@@ -0,0 +1,194 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: Batch analysis of Gess positions across a pool of worker processes. The positions are packed with
+#              GessGame.to_bytes into one shared memory block and the workers write their results into another,
+#              so only block names and index ranges are sent to the workers. The workers live as long as the
+#              PositionAnalyzer and each keeps its GessGame, evaluation cache and transposition table, which stay
+#              warm from batch to batch.
+#              Usage: analyze_positions([game.to_bytes() for game in games], depth=2, workers=4)
+
+import atexit
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from GessGame import GessGame, BLACK, WHITE, GAME_BYTES, GAME_BYTES_VERSION, GAME_STATES, square_name
+
+# number of legal moves, black rings, white rings, center and destination of the best move (-1 if none), score
+RESULT = struct.Struct('<HBBhhi')
+
+_game = None  # the GessGame of a worker process
+_evaluator = None  # the Evaluator of a worker process, shared by its engines
+_table = None  # the TranspositionTable of a worker process, shared by its engines
+_engines = {}  # SearchEngine of a worker process for each search depth
+
+
+def _init_worker():
+    """
+    Sets up a worker process with the game, evaluation cache and transposition table it reuses for every position
+    :return: none
+    """
+    global _game, _evaluator, _table
+    from evaluation import Evaluator
+    from transposition_table import TranspositionTable
+    _game = GessGame()
+    _evaluator = Evaluator()
+    _table = TranspositionTable()
+
+
+def _get_engine(depth):
+    """
+    Gets the engine of a worker process for a search depth, making it the first time
+    :param depth: depth to search to
+    :return: the SearchEngine
+    """
+    engine = _engines.get(depth)
+    if engine is None:
+        from engine import SearchEngine
+        engine = _engines[depth] = SearchEngine(time_limit=float('inf'), max_depth=depth, evaluate=_evaluator,
+                                                table=_table)
+    return engine
+
+
+def _analyze_range(positions_name, results_name, start, stop, depth):
+    """
+    Analyzes some of the positions of a batch, reading them from and writing the results to shared memory
+    :param positions_name: name of the shared memory block holding the packed positions
+    :param results_name: name of the shared memory block the results go in
+    :param start: index of the first position to analyze
+    :param stop: index after the last position to analyze
+    :param depth: depth to search each position to, 0 for no search
+    :return: number of positions analyzed
+    """
+    from engine import WIN_SCORE
+    positions = shared_memory.SharedMemory(positions_name)
+    results = shared_memory.SharedMemory(results_name)
+    try:
+        game = _game
+        position = game.get_board().get_position()
+        engine = _get_engine(depth) if depth > 0 else None
+        for index in range(start, stop):
+            version, black_stones, white_stones, side, state, black_remaining, black_rings, white_remaining, \
+                white_rings = GAME_BYTES.unpack_from(positions.buf, index * GAME_BYTES.size)
+            game.load_position(int.from_bytes(black_stones, 'little'), int.from_bytes(white_stones, 'little'),
+                               side, GAME_STATES[state])
+            move_count = sum(1 for move in position.generate_moves(side))
+            best_move = (-1, -1)
+            if game.get_game_state() != 'UNFINISHED':
+                score = -WIN_SCORE
+            elif engine is not None:
+                move, score = engine.search(game)
+                if move is not None:
+                    best_move = move
+            else:
+                score = _evaluator(position, side)
+            RESULT.pack_into(results.buf, index * RESULT.size, move_count, position.get_ring_count(BLACK),
+                             position.get_ring_count(WHITE), best_move[0], best_move[1], score)
+        return stop - start
+    finally:
+        positions.close()
+        results.close()
+
+
+class PositionAnalyzer:
+    """
+    Class to represent a pool of long-lived worker processes for analyzing positions
+    Responsibilities:
+    Packs batches of positions into shared memory and splits them among the workers
+    Reads the results back out of shared memory
+    Collaborators:
+    GessGame
+    SearchEngine and Evaluator, in the worker processes
+    """
+
+    def __init__(self, workers=None):
+        """
+        Init method to initialize a PositionAnalyzer object, starting the worker processes
+        :param workers: number of processes, every core if None
+        """
+        self._workers = workers or os.cpu_count()
+        self._executor = ProcessPoolExecutor(self._workers, initializer=_init_worker)
+
+    def analyze(self, positions, depth=1):
+        """
+        Analyzes a batch of positions
+        :param positions: list of GessGame objects or buffers from GessGame.to_bytes
+        :param depth: depth to search each position to, 0 to only evaluate it
+        :return: list of dicts, one per position, with the number of legal moves for the side to move, the ring
+                 counts of both sides, the best move as coordinates (None if there is no move or depth is 0) and
+                 its score for the side to move
+        """
+        count = len(positions)
+        if not count:
+            return []
+        packed = shared_memory.SharedMemory(create=True, size=count * GAME_BYTES.size)
+        results = shared_memory.SharedMemory(create=True, size=count * RESULT.size)
+        try:
+            for index, game in enumerate(positions):
+                data = game.to_bytes() if isinstance(game, GessGame) else game
+                if data[0] != GAME_BYTES_VERSION:
+                    raise ValueError("unknown game buffer version: {}".format(data[0]))
+                packed.buf[index * GAME_BYTES.size:(index + 1) * GAME_BYTES.size] = data
+            chunk = max(1, -(-count // (self._workers * 4)))
+            futures = [self._executor.submit(_analyze_range, packed.name, results.name, start,
+                                             min(start + chunk, count), depth)
+                       for start in range(0, count, chunk)]
+            for future in futures:
+                future.result()
+            analyzed = []
+            for moves, black_rings, white_rings, center, new_center, score in RESULT.iter_unpack(results.buf):
+                analyzed.append({
+                    'moves': moves,
+                    'black_rings': black_rings,
+                    'white_rings': white_rings,
+                    'best_move': None if center < 0 else (square_name(center), square_name(new_center)),
+                    'score': score,
+                })
+            return analyzed
+        finally:
+            packed.close()
+            packed.unlink()
+            results.close()
+            results.unlink()
+
+    def close(self):
+        """
+        Stops the worker processes
+        :return: none
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_analyzers = {}  # PositionAnalyzer for each number of workers, kept for later calls to analyze_positions
+
+
+def analyze_positions(positions, depth=1, workers=None):
+    """
+    Analyzes a batch of positions with a pool of workers that is started on the first call and reused after that
+    :param positions: list of GessGame objects or buffers from GessGame.to_bytes
+    :param depth: depth to search each position to, 0 to only evaluate it
+    :param workers: number of processes, every core if None
+    :return: list of result dicts, see PositionAnalyzer.analyze
+    """
+    analyzer = _analyzers.get(workers)
+    if analyzer is None:
+        analyzer = _analyzers[workers] = PositionAnalyzer(workers)
+    return analyzer.analyze(positions, depth)
+
+
+@atexit.register
+def _close_analyzers():
+    """
+    Stops the pools started by analyze_positions when the program exits
+    :return: none
+    """
+    for analyzer in _analyzers.values():
+        analyzer.close()
+    _analyzers.clear()
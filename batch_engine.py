@@ -0,0 +1,292 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: A batched Gess engine built on NumPy for stepping many independent games at once, e.g. for training.
+#              B boards are kept in one (B, 20, 20) int8 array, and piece centers, rings and moves are worked out
+#              for every board at once with 3x3 sliding windows. The rules are the same as in GessGame, which
+#              running this file checks on random games.
+#              Requires NumPy (pip install numpy), which nothing else in the game needs.
+#              Usage: python batch_engine.py [GAMES] [PLIES]
+
+import random
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("batch_engine requires NumPy, install it with: pip install numpy") from None
+
+from GessGame import GessGame, Position, BLACK, WHITE, BOARD_SIZE, DIRECTIONS
+
+EMPTY = 0
+BLACK_STONE = 1
+WHITE_STONE = 2
+STONE_VALUES = (BLACK_STONE, WHITE_STONE)  # value of each side's stones in the array, indexed by BLACK or WHITE
+INNER = BOARD_SIZE - 2  # squares per side that can be the center of a piece
+# (row, column) steps covering a whole 3x3 footprint, center included
+FOOTPRINT_STEPS = np.array([(0, 0)] + list(DIRECTIONS), dtype=np.intp)
+
+
+def position_to_array(position):
+    """
+    Converts a Position to a (20, 20) array of EMPTY, BLACK_STONE and WHITE_STONE
+    :param position: the Position
+    :return: int8 array indexed by [row, column]
+    """
+    board = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.int8)
+    for side in (BLACK, WHITE):
+        stones = np.frombuffer(position.get_stones(side).to_bytes(BOARD_SIZE * BOARD_SIZE // 8, 'little'),
+                               dtype=np.uint8)
+        board[np.unpackbits(stones, bitorder='little').astype(bool)] = STONE_VALUES[side]
+    return board.reshape(BOARD_SIZE, BOARD_SIZE)
+
+
+def array_to_position(board):
+    """
+    Converts a (20, 20) array of EMPTY, BLACK_STONE and WHITE_STONE to a Position
+    :param board: int8 array indexed by [row, column]
+    :return: the Position
+    """
+    stones = []
+    for side in (BLACK, WHITE):
+        bits = np.packbits(board.reshape(-1) == STONE_VALUES[side], bitorder='little')
+        stones.append(int.from_bytes(bits.tobytes(), 'little'))
+    return Position(stones[BLACK], stones[WHITE])
+
+
+class BatchGames:
+    """
+    Class to represent many games of Gess played side by side
+    Responsibilities:
+    Keeps the boards of every game in one array, along with the side to move and whether the game is over
+    Finds the valid piece centers and the rings of every board at once
+    Applies one move on every board at once, removing captured stones and stones left on the edge
+    Collaborators:
+    GessGame
+    Position
+    """
+
+    def __init__(self, count=None, boards=None, sides=None):
+        """
+        Init method to initialize a BatchGames object, either with count games from the starting position or
+        with the given boards
+        :param count: number of games starting from the usual setup
+        :param boards: (B, 20, 20) int8 array of boards to start from instead
+        :param sides: (B,) array with BLACK or WHITE to move on each board, all BLACK if None
+        """
+        if boards is None:
+            start = position_to_array(GessGame().get_board().get_position())
+            boards = np.repeat(start[np.newaxis], count, axis=0)
+        self._boards = np.ascontiguousarray(boards, dtype=np.int8)
+        count = len(self._boards)
+        self._sides = np.zeros(count, dtype=np.int8) if sides is None else np.asarray(sides, dtype=np.int8).copy()
+        self._winners = np.full(count, -1, dtype=np.int8)
+
+    def get_boards(self):
+        """
+        Getter method
+        :return: (B, 20, 20) int8 array of the boards
+        """
+        return self._boards
+
+    def get_sides(self):
+        """
+        Getter method
+        :return: (B,) array with the side to move on each board
+        """
+        return self._sides
+
+    def get_winners(self):
+        """
+        Getter method
+        :return: (B,) array with BLACK or WHITE for the winner of each finished game and -1 for unfinished games
+        """
+        return self._winners
+
+    def get_position(self, index):
+        """
+        Converts one of the boards to a Position
+        :param index: number of the board
+        :return: the Position, with the side to move set
+        """
+        position = array_to_position(self._boards[index])
+        position.set_side_to_move(int(self._sides[index]))
+        return position
+
+    def _windows(self, values):
+        """
+        Looks at the 3x3 window around every center square of every board
+        :param values: (B, 20, 20) array
+        :return: list of nine (B, 18, 18) views, the center first and then the squares in the order of DIRECTIONS
+        """
+        return [values[:, 1 + row_step:1 + row_step + INNER, 1 + column_step:1 + column_step + INNER]
+                for row_step, column_step in FOOTPRINT_STEPS]
+
+    def _stones(self, sides):
+        """
+        Finds the stones of one side on each board
+        :param sides: (B,) array with BLACK or WHITE for each board
+        :return: (B, 20, 20) bool array
+        """
+        values = np.where(sides == BLACK, BLACK_STONE, WHITE_STONE).astype(np.int8)
+        return self._boards == values[:, np.newaxis, np.newaxis]
+
+    def piece_masks(self, sides=None):
+        """
+        Finds the valid piece centers of every board, where a piece has no opposing stones in its 3x3 window and
+        at least one of the side's stones around its center
+        :param sides: (B,) array with the side to check on each board, the side to move if None
+        :return: (B, 20, 20) bool array, True on the valid centers
+        """
+        if sides is None:
+            sides = self._sides
+        own = self._windows(self._stones(sides))
+        opposing = self._windows(self._stones(1 - sides))
+        has_own = np.logical_or.reduce(own[1:])
+        has_opposing = np.logical_or.reduce(opposing)
+        masks = np.zeros(self._boards.shape, dtype=bool)
+        masks[:, 1:-1, 1:-1] = has_own & ~has_opposing
+        return masks
+
+    def ring_masks(self, sides=None):
+        """
+        Finds the rings of every board, where a ring is an empty center surrounded by eight of the side's stones
+        :param sides: (B,) array with the side to check on each board, the side to move if None
+        :return: (B, 20, 20) bool array, True on the ring centers
+        """
+        if sides is None:
+            sides = self._sides
+        own = self._windows(self._stones(sides))
+        empty = self._windows(self._boards == EMPTY)[0]
+        masks = np.zeros(self._boards.shape, dtype=bool)
+        masks[:, 1:-1, 1:-1] = empty & np.logical_and.reduce(own[1:])
+        return masks
+
+    def ring_counts(self, sides=None):
+        """
+        Counts the rings of every board
+        :param sides: (B,) array with the side to check on each board, the side to move if None
+        :return: (B,) array of ring counts
+        """
+        return self.ring_masks(sides).sum(axis=(1, 2))
+
+    def apply_moves(self, centers, new_centers):
+        """
+        Moves one piece on every board for the side to move. The stones under the new footprint are captured and
+        stones left on the edge are removed. A board whose game is over, or whose center is -1, is left alone.
+        The moves are not checked, they should be legal moves from a move generator.
+        :param centers: (B,) array of the square index of each piece's center, row * 20 + column
+        :param new_centers: (B,) array of the square index each center moves to
+        :return: tuple of two (B,) arrays, the number of the mover's stones removed and the number of opposing
+                 stones removed on each board
+        """
+        centers = np.asarray(centers, dtype=np.intp)
+        new_centers = np.asarray(new_centers, dtype=np.intp)
+        active = np.flatnonzero((centers >= 0) & (self._winners == -1))
+        sides = self._sides.copy()
+        own_before = self._stones(sides).sum(axis=(1, 2))
+        opposing_before = self._stones(1 - sides).sum(axis=(1, 2))
+        if len(active):
+            boards = active[:, np.newaxis]
+            rows = centers[active, np.newaxis] // BOARD_SIZE + FOOTPRINT_STEPS[:, 0]
+            columns = centers[active, np.newaxis] % BOARD_SIZE + FOOTPRINT_STEPS[:, 1]
+            new_rows = new_centers[active, np.newaxis] // BOARD_SIZE + FOOTPRINT_STEPS[:, 0]
+            new_columns = new_centers[active, np.newaxis] % BOARD_SIZE + FOOTPRINT_STEPS[:, 1]
+            pieces = self._boards[boards, rows, columns]
+            self._boards[boards, rows, columns] = EMPTY
+            self._boards[boards, new_rows, new_columns] = pieces
+            self._boards[active, 0, :] = EMPTY
+            self._boards[active, -1, :] = EMPTY
+            self._boards[active, :, 0] = EMPTY
+            self._boards[active, :, -1] = EMPTY
+        own_removed = own_before - self._stones(sides).sum(axis=(1, 2))
+        opposing_removed = opposing_before - self._stones(1 - sides).sum(axis=(1, 2))
+        if len(active):
+            # the mover can't lose its own last ring with a legal move, so only the other side can run out
+            opposing_rings = self.ring_counts(1 - sides)
+            finished = active[opposing_rings[active] == 0]
+            self._winners[finished] = sides[finished]
+            self._sides[active] = 1 - sides[active]
+        return own_removed, opposing_removed
+
+
+def mask_to_bitboard(mask):
+    """
+    Converts a (20, 20) bool array to a bitboard like the ones a Position keeps
+    :param mask: bool array indexed by [row, column]
+    :return: int with bit row * 20 + column set where the array is True
+    """
+    return int.from_bytes(np.packbits(mask.reshape(-1), bitorder='little').tobytes(), 'little')
+
+
+def check_against_game(count=64, plies=120, seed=1):
+    """
+    Plays random games with GessGame and the same moves with BatchGames, comparing the boards, piece centers,
+    rings, stones removed and winners after every move
+    :param count: number of games
+    :param plies: most moves played in each game
+    :param seed: seed for choosing the moves
+    :return: list of (game, ply, what) tuples for everything that differed
+    """
+    rng = random.Random(seed)
+    games = [GessGame() for index in range(count)]
+    batch = BatchGames(count)
+    mismatches = []
+    for ply in range(plies):
+        centers = np.full(count, -1, dtype=np.intp)
+        new_centers = np.full(count, -1, dtype=np.intp)
+        removed = [(0, 0)] * count
+        for index, game in enumerate(games):
+            if game.get_game_state() != 'UNFINISHED':
+                continue
+            position = game.get_board().get_position()
+            side = game.get_current_player().get_side()
+            moves = list(position.generate_moves(side))
+            if not moves:
+                continue
+            centers[index], new_centers[index] = rng.choice(moves)
+            own_before = position.get_stones(side).bit_count()
+            opposing_before = position.get_stones(1 - side).bit_count()
+            game.make_move_at(int(centers[index]), int(new_centers[index]))
+            removed[index] = (own_before - position.get_stones(side).bit_count(),
+                              opposing_before - position.get_stones(1 - side).bit_count())
+        if not (centers >= 0).any():
+            break
+        own_removed, opposing_removed = batch.apply_moves(centers, new_centers)
+        for side in (BLACK, WHITE):
+            sides = np.full(count, side, dtype=np.int8)
+            piece_masks = batch.piece_masks(sides)
+            ring_masks = batch.ring_masks(sides)
+            for index, game in enumerate(games):
+                position = game.get_board().get_position()
+                if mask_to_bitboard(batch.get_boards()[index] == STONE_VALUES[side]) != position.get_stones(side):
+                    mismatches.append((index, ply, 'stones'))
+                if mask_to_bitboard(piece_masks[index]) != position.piece_centers(side):
+                    mismatches.append((index, ply, 'piece centers'))
+                if mask_to_bitboard(ring_masks[index]) != position.get_rings(side):
+                    mismatches.append((index, ply, 'rings'))
+        for index, game in enumerate(games):
+            if centers[index] >= 0 and (own_removed[index], opposing_removed[index]) != removed[index]:
+                mismatches.append((index, ply, 'stones removed'))
+            winner = batch.get_winners()[index]
+            state = 'UNFINISHED' if winner == -1 else ('BLACK_WON', 'WHITE_WON')[winner]
+            if state != game.get_game_state():
+                mismatches.append((index, ply, 'winner'))
+    return mismatches
+
+
+def main():
+    """
+    Checks BatchGames against GessGame on random games
+    :return: 0 if everything matched, 1 otherwise
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    plies = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    mismatches = check_against_game(count, plies)
+    for index, ply, what in mismatches:
+        print("MISMATCH game {} ply {}: {}".format(index, ply, what))
+    print("{} games, {} plies: {}".format(count, plies, "mismatches found" if mismatches else "all matched"))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
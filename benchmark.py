@@ -0,0 +1,222 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: Benchmark harness for the Gess rules. Measures how many nodes per second the move generator,
+#              push_move/pop_move and ring detection get through on a fixed set of positions, can save the results
+#              as a JSON baseline and fails when a later run is slower than the baseline by more than a threshold.
+#              Also measures how fast new games are constructed and how much memory an idle game takes.
+#              Usage: python benchmark.py [--save FILE] [--compare FILE] [--threshold 0.2]
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from GessGame import GessGame, BLACK, WHITE
+from perft import SAVED_POSITIONS, make_game
+
+
+def sample_games(count=16, seed=1):
+    """
+    Builds the positions the benchmarks run on: the starting position, the saved perft positions and positions
+    from random games, which are the same every run because of the fixed seed
+    :param count: number of positions from random games
+    :param seed: seed for the random games
+    :return: list of GessGame objects
+    """
+    games = [make_game('start')] + [make_game(name) for name in SAVED_POSITIONS]
+    rng = random.Random(seed)
+    while len(games) < count + 1 + len(SAVED_POSITIONS):
+        game = GessGame()
+        for ply in range(rng.randrange(4, 40)):
+            moves = list(game.get_board().get_position().generate_moves(game.get_current_player().get_side()))
+            if not moves or game.get_game_state() != 'UNFINISHED':
+                break
+            game.push_move(*rng.choice(moves))
+        if game.get_game_state() == 'UNFINISHED':
+            games.append(game)
+    return games
+
+
+def _measure(run, min_time):
+    """
+    Calls run until min_time has passed
+    :param run: function that does one round of work and returns the number of nodes it handled
+    :param min_time: seconds to keep running for
+    :return: nodes per second
+    """
+    nodes = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        nodes += run()
+        elapsed = time.perf_counter() - start
+    return nodes / elapsed
+
+
+def bench_move_generation(games, min_time):
+    """
+    Measures legal moves generated per second
+    :param games: positions to run on
+    :param min_time: seconds to run for
+    :return: moves per second
+    """
+    def run():
+        nodes = 0
+        for game in games:
+            for move in game.get_board().get_position().generate_moves(game.get_current_player().get_side()):
+                nodes += 1
+        return nodes
+    return _measure(run, min_time)
+
+
+def bench_make_unmake(games, min_time):
+    """
+    Measures push_move and pop_move pairs per second over every legal move of each position
+    :param games: positions to run on
+    :param min_time: seconds to run for
+    :return: moves made and taken back per second
+    """
+    move_lists = [list(game.get_board().get_position().generate_moves(game.get_current_player().get_side()))
+                  for game in games]
+
+    def run():
+        nodes = 0
+        for game, moves in zip(games, move_lists):
+            for center, new_center in moves:
+                game.push_move(center, new_center)
+                game.pop_move()
+            nodes += len(moves)
+        return nodes
+    return _measure(run, min_time)
+
+
+def bench_ring_detection(games, min_time):
+    """
+    Measures full-board ring scans per second, one scan for each side of each position
+    :param games: positions to run on
+    :param min_time: seconds to run for
+    :return: scans per second
+    """
+    positions = [game.get_board().get_position() for game in games]
+
+    def run():
+        for position in positions:
+            position.scan_rings(BLACK)
+            position.scan_rings(WHITE)
+        return 2 * len(positions)
+    return _measure(run, min_time)
+
+
+def bench_construction(games, min_time):
+    """
+    Measures new games constructed per second
+    :param games: not used, construction always starts from the starting position
+    :param min_time: seconds to run for
+    :return: games constructed per second
+    """
+    def run():
+        for count in range(100):
+            GessGame()
+        return 100
+    return _measure(run, min_time)
+
+
+def game_memory(count=1000, plies=0, seed=1):
+    """
+    Measures the memory held by games that are kept alive, as a server keeps idle games, after a number of
+    random moves have been played in each
+    :param count: number of games to keep alive while measuring
+    :param plies: number of random legal moves to play in each game first
+    :param seed: seed for the random moves
+    :return: bytes per game
+    """
+    rng = random.Random(seed)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = [GessGame() for count in range(count)]
+    for game in games:
+        position = game.get_board().get_position()
+        for ply in range(plies):
+            moves = list(position.generate_moves(game.get_current_player().get_side()))
+            if not moves or game.get_game_state() != 'UNFINISHED':
+                break
+            game.make_move_at(*rng.choice(moves))
+    after = tracemalloc.get_traced_memory()[0]
+    if not was_tracing:
+        tracemalloc.stop()
+    return (after - before) / len(games)
+
+
+BENCHMARKS = {
+    'move_generation': bench_move_generation,
+    'make_unmake': bench_make_unmake,
+    'ring_detection': bench_ring_detection,
+    'construction': bench_construction,
+}
+
+
+def run_benchmarks(min_time=1.0):
+    """
+    Runs every benchmark
+    :param min_time: seconds each benchmark runs for
+    :return: dict of benchmark name -> nodes per second
+    """
+    games = sample_games()
+    return {name: benchmark(games, min_time) for name, benchmark in BENCHMARKS.items()}
+
+
+def compare(results, baseline, threshold):
+    """
+    Finds the benchmarks that got slower than the baseline by more than the threshold
+    :param results: dict of benchmark name -> nodes per second
+    :param baseline: dict of benchmark name -> nodes per second from an earlier run
+    :param threshold: fraction the speed can drop by before it counts, e.g. 0.2 for 20%
+    :return: list of (name, baseline speed, current speed) tuples for the slow benchmarks
+    """
+    regressions = []
+    for name, speed in results.items():
+        if name in baseline and speed < baseline[name] * (1 - threshold):
+            regressions.append((name, baseline[name], speed))
+    return regressions
+
+
+def main():
+    """
+    Runs the benchmarks from the command line
+    :return: 1 if a benchmark is slower than the baseline, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Gess rules benchmarks")
+    parser.add_argument('--save', help="write the results to this JSON file as a new baseline")
+    parser.add_argument('--compare', help="JSON baseline to compare the results with")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown, default 0.2 for 20%%")
+    parser.add_argument('--time', type=float, default=1.0, help="seconds each benchmark runs for")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.time)
+    for name, speed in results.items():
+        print("{:16s} {:12.0f} nodes/s".format(name, speed))
+    bytes_per_game = {'new': game_memory(), 'played_100': game_memory(50, 100)}
+    print("{:16s} {:12.0f} bytes/game".format('new_game', bytes_per_game['new']))
+    print("{:16s} {:12.0f} bytes/game".format('played_game', bytes_per_game['played_100']))
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump({'python': platform.python_version(), 'results': results, 'bytes_per_game': bytes_per_game},
+                      baseline_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, old_speed, speed in regressions:
+            print("REGRESSION {}: {:.0f} nodes/s, baseline {:.0f} nodes/s".format(name, speed, old_speed))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
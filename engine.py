@@ -0,0 +1,333 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: A computer opponent for Gess. SearchEngine runs a negamax alpha-beta search with iterative deepening
+#              and aspiration windows on a GessGame, using push_move/pop_move to look ahead, and returns the best
+#              move it found before its time runs out in the coordinates make_move takes.
+
+import time
+
+from GessGame import BOARD_SIZE, FOOTPRINT
+from transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 1000000  # score of a won game, less the number of moves it takes to win
+STONE_SCORE = 10  # worth of a stone in the default evaluation
+RING_SCORE = 300  # worth of a ring in the default evaluation
+MAX_PLY = 128
+
+
+def material_evaluation(position, side):
+    """
+    Default evaluation of a position, counting stones and rings
+    :param position: the Position to evaluate
+    :param side: BLACK or WHITE, the side the score is for
+    :return: score, positive if the side is ahead
+    """
+    stones = position.get_stones(side).bit_count() - position.get_stones(1 - side).bit_count()
+    rings = position.get_ring_count(side) - position.get_ring_count(1 - side)
+    return stones * STONE_SCORE + rings * RING_SCORE
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when the time for the move has run out
+    """
+
+
+class SearchEngine:
+    """
+    Class to represent a computer player that searches ahead with alpha-beta
+    Responsibilities:
+    Searches a game deeper and deeper until its time runs out
+    Orders moves so the best ones are tried first: the move from the transposition table, then captures, then
+    killer moves and moves with a good history
+    Remembers searched positions in a transposition table
+    Collaborators:
+    GessGame
+    Position
+    TranspositionTable
+    """
+
+    def __init__(self, time_limit=0.1, max_depth=32, evaluate=material_evaluation, table=None,
+                 aspiration_window=50, book=None):
+        """
+        Init method to initialize a SearchEngine object
+        :param time_limit: seconds the engine can take for a move
+        :param max_depth: deepest search the engine will start
+        :param evaluate: function taking a Position and a side that returns a score for that side
+        :param table: TranspositionTable to use, a new 16 MB table if None
+        :param aspiration_window: how far from the last iteration's score the next one searches at first
+        :param book: OpeningBook whose moves are played without searching, or None
+        """
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._evaluate = evaluate
+        self._table = table if table is not None else TranspositionTable()
+        self._aspiration_window = aspiration_window
+        self._book = book
+        self._killers = [[None, None] for ply in range(MAX_PLY)]
+        self._history = [0] * (BOARD_SIZE * BOARD_SIZE * BOARD_SIZE * BOARD_SIZE)
+        self._game = None
+        self._position = None
+        self._deadline = 0
+        self._nodes = 0
+        self._depth_reached = 0
+        # best root move of the iteration being searched, and its score, once one has been searched in full
+        self._root_best = None
+
+    def get_table(self):
+        """
+        Getter method
+        :return: the engine's TranspositionTable
+        """
+        return self._table
+
+    def get_stats(self):
+        """
+        Getter method
+        :return: dict with the nodes searched and the depth of the last completed iteration
+        """
+        return {'nodes': self._nodes, 'depth': self._depth_reached}
+
+    def choose_move(self, game):
+        """
+        Finds the best move for the current player
+        :param game: GessGame to search, it is left as it was found
+        :return: tuple of the center and destination coordinates, e.g. ('m3', 'm6'), or None if there is no legal move
+        """
+        best_move, score = self.search(game)
+        if best_move is None:
+            return None
+        board = game.get_board()
+        return board.get_coordinate(best_move[0]), board.get_coordinate(best_move[1])
+
+    def search(self, game):
+        """
+        Searches with iterative deepening until the time limit or max_depth is reached. Each iteration after the
+        first searches a window around the previous score first and searches again with a full window if the
+        score falls outside it. A position in the opening book isn't searched, the book move is played with a
+        score of 0.
+        :param game: GessGame to search
+        :return: tuple of the best move as (center, new_center) square indexes, or None, and its score
+        """
+        self._game = game
+        self._position = game.get_board().get_position()
+        self._deadline = time.perf_counter() + self._time_limit
+        self._nodes = 0
+        self._depth_reached = 0
+        self._root_best = None
+        self._table.new_search()
+        for ply in range(MAX_PLY):
+            self._killers[ply][0] = self._killers[ply][1] = None
+        if self._book is not None:
+            book_move = self._book.best_move(self._position)
+            if book_move is not None:
+                return book_move, 0
+        side = game.get_current_player().get_side()
+        root_moves = list(self._position.generate_moves(side))
+        if not root_moves:
+            return None, -WIN_SCORE
+        entry = self._table.probe(self._position.get_hash())
+        root_moves = self._order_moves(root_moves, side, 0, entry[3] if entry is not None else None)
+        best_move = root_moves[0]
+        best_score = 0
+        for depth in range(1, self._max_depth + 1):
+            self._root_best = None
+            try:
+                if depth == 1:
+                    score, move = self._search_root(root_moves, depth, -WIN_SCORE - 1, WIN_SCORE + 1)
+                else:
+                    window = self._aspiration_window
+                    alpha = best_score - window
+                    beta = best_score + window
+                    score, move = self._search_root(root_moves, depth, alpha, beta)
+                    if score <= alpha or score >= beta:
+                        score, move = self._search_root(root_moves, depth, -WIN_SCORE - 1, WIN_SCORE + 1)
+            except SearchTimeout:
+                # the moves searched in full before time ran out can still beat the last iteration's move
+                if self._root_best is not None:
+                    best_move, best_score = self._root_best
+                break
+            best_move, best_score = move, score
+            self._depth_reached = depth
+            # try the best move first in the next iteration
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if abs(score) >= WIN_SCORE - MAX_PLY:
+                break
+        return best_move, best_score
+
+    def _search_root(self, moves, depth, alpha, beta):
+        """
+        Searches every root move, keeping the best move searched in full so far in _root_best in case time runs
+        out before the last one
+        :param moves: list of legal moves of the current player, best guess first
+        :param depth: depth to search to
+        :param alpha: lower bound of the window
+        :param beta: upper bound of the window
+        :return: tuple of the best score and the move that got it
+        """
+        game = self._game
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = moves[0]
+        for move in moves:
+            game.push_move(move[0], move[1])
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                game.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self._root_best = (move, score)
+                if alpha >= beta:
+                    break
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(self._position.get_hash(), depth, best_score, bound, best_move)
+        return best_score, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        """
+        Searches a position from the point of view of the side to move
+        :param depth: remaining depth
+        :param alpha: lower bound of the window
+        :param beta: upper bound of the window
+        :param ply: number of moves from the root
+        :return: score of the position for the side to move
+        """
+        self._nodes += 1
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        game = self._game
+        position = self._position
+        if game.get_game_state() != 'UNFINISHED':
+            # the last move won the game
+            return -WIN_SCORE + ply
+        side = game.get_current_player().get_side()
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._evaluate(position, side)
+
+        key = position.get_hash()
+        entry = self._table.probe(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, entry_bound, table_move = entry
+            if entry_depth >= depth:
+                entry_score = self._score_from_table(entry_score, ply)
+                if entry_bound == EXACT:
+                    return entry_score
+                if entry_bound == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_bound == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        moves = self._order_moves(list(position.generate_moves(side)), side, ply, table_move)
+        if not moves:
+            # every move would give up the last ring
+            return -WIN_SCORE + ply
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in moves:
+            game.push_move(move[0], move[1])
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._remember_cutoff(move, side, depth, ply)
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(key, depth, self._score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _order_moves(self, moves, side, ply, table_move):
+        """
+        Sorts moves so the move from the transposition table comes first, then captures with the most opposing
+        stones taken, then the killer moves of this ply and then the rest by their history score
+        :param moves: list of (center, new_center) tuples
+        :param side: BLACK or WHITE, the side moving
+        :param ply: number of moves from the root
+        :param table_move: best move stored in the transposition table, or None
+        :return: the sorted list
+        """
+        opposing = self._position.get_stones(1 - side)
+        killers = self._killers[ply]
+        history = self._history
+
+        def move_order(move):
+            if move == table_move:
+                return 1 << 40
+            captured = (opposing & FOOTPRINT[move[1]]).bit_count()
+            if captured:
+                return (1 << 32) + captured
+            if move == killers[0] or move == killers[1]:
+                return 1 << 31
+            return history[move[0] * BOARD_SIZE * BOARD_SIZE + move[1]]
+
+        moves.sort(key=move_order, reverse=True)
+        return moves
+
+    def _remember_cutoff(self, move, side, depth, ply):
+        """
+        Remembers a quiet move that caused a cutoff as a killer move for this ply and adds to its history score
+        :param move: (center, new_center) tuple
+        :param side: BLACK or WHITE, the side that moved
+        :param depth: remaining depth where the cutoff happened
+        :param ply: number of moves from the root
+        :return: none
+        """
+        if self._position.get_stones(1 - side) & FOOTPRINT[move[1]]:
+            return
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[move[0] * BOARD_SIZE * BOARD_SIZE + move[1]] += depth * depth
+
+    @staticmethod
+    def _score_to_table(score, ply):
+        """
+        Stores win scores as the distance from the position instead of the root
+        :param score: score from the search
+        :param ply: number of moves from the root
+        :return: score to store
+        """
+        if score >= WIN_SCORE - MAX_PLY:
+            return score + ply
+        if score <= -WIN_SCORE + MAX_PLY:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_table(score, ply):
+        """
+        Turns a stored win score back into one measured from the root
+        :param score: score from the table
+        :param ply: number of moves from the root
+        :return: score for the search
+        """
+        if score >= WIN_SCORE - MAX_PLY:
+            return score - ply
+        if score <= -WIN_SCORE + MAX_PLY:
+            return score + ply
+        return score
@@ -0,0 +1,220 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: A weighted evaluation of Gess positions for the search engine, made of material, rings, ring safety
+#              and mobility terms. Evaluator remembers the scores of positions it has seen in a least recently used
+#              cache with a memory budget, since the same positions come up again on every pass of iterative
+#              deepening and in game after game of a tournament.
+#              Usage: SearchEngine(evaluate=Evaluator())
+
+from collections import OrderedDict
+
+from GessGame import BLACK, WHITE, AFFECTED, ZOBRIST_WHITE_TO_MOVE, bitboard_squares
+
+DEFAULT_WEIGHTS = {'material': 10, 'rings': 300, 'ring_safety': 5, 'mobility': 1}
+CACHE_ENTRY_BYTES = 176  # memory taken by one cached score, measured with tracemalloc on CPython 3.11
+
+
+def material_term(position, side):
+    """
+    Counts stones, the same numbers as Player.get_remaining_stones for the players of a game
+    :param position: the Position to evaluate
+    :param side: BLACK or WHITE, the side the score is for
+    :return: the side's stones less the opposing stones
+    """
+    return position.get_stones(side).bit_count() - position.get_stones(1 - side).bit_count()
+
+
+def ring_term(position, side):
+    """
+    Counts rings
+    :param position: the Position to evaluate
+    :param side: BLACK or WHITE, the side the score is for
+    :return: the side's rings less the opposing rings
+    """
+    return position.get_ring_count(side) - position.get_ring_count(1 - side)
+
+
+# the last counts worked out by _move_counts for each side, as (position hash, (moves, threats)), so that the
+# mobility and ring safety terms of one evaluation share a single pass over the side's moves
+_move_count_cache = [(None, None), (None, None)]
+
+
+def _move_counts(position, side):
+    """
+    Counts the moves of a side in one pass, as Board.possible_moves would list them for each of its pieces but
+    without the ring check, along with how many of them land the footprint on one of the other side's rings
+    :param position: the Position to look at
+    :param side: BLACK or WHITE, the side moving
+    :return: tuple of the number of moves and the number of threats
+    """
+    key = position.get_hash()
+    cached_key, counts = _move_count_cache[side]
+    if cached_key == key:
+        return counts
+    target = 0
+    for ring in bitboard_squares(position.get_rings(1 - side)):
+        target |= AFFECTED[ring]
+    moves = 0
+    threats = 0
+    for center in bitboard_squares(position.piece_centers(side)):
+        new_centers = position.piece_moves(center, side)
+        moves += len(new_centers)
+        if target:
+            for new_center in new_centers:
+                threats += target >> new_center & 1
+    counts = (moves, threats)
+    _move_count_cache[side] = (key, counts)
+    return counts
+
+
+def ring_safety_term(position, side):
+    """
+    Weighs how exposed each side's rings are, where a ring is threatened by every opposing move landing close
+    enough for the footprint to cover part of it
+    :param position: the Position to evaluate
+    :param side: BLACK or WHITE, the side the score is for
+    :return: threats against the opposing rings less threats against the side's rings
+    """
+    return _move_counts(position, side)[1] - _move_counts(position, 1 - side)[1]
+
+
+def mobility_term(position, side):
+    """
+    Counts moves
+    :param position: the Position to evaluate
+    :param side: BLACK or WHITE, the side the score is for
+    :return: the side's moves less the opposing moves
+    """
+    return _move_counts(position, side)[0] - _move_counts(position, 1 - side)[0]
+
+
+# every term takes a Position and a side and gives the side's value less the other side's, so that the score of
+# one side is always the negative of the score of the other
+TERMS = {
+    'material': material_term,
+    'rings': ring_term,
+    'ring_safety': ring_safety_term,
+    'mobility': mobility_term,
+}
+
+
+class Evaluator:
+    """
+    Class to represent a weighted evaluation with a cache of the positions it has scored
+    Responsibilities:
+    Adds up the weighted terms for a position
+    Remembers scores by the position's Zobrist hash, dropping the least recently used ones when the cache is full
+    Forgets every score when the weights change
+    Counts cache hits and misses
+    Collaborators:
+    Position
+    """
+
+    def __init__(self, weights=None, memory_bytes=8 * 1024 * 1024, terms=None):
+        """
+        Init method to initialize an Evaluator object
+        :param weights: dict of term name -> weight, DEFAULT_WEIGHTS if None
+        :param memory_bytes: about how much memory the cache can use
+        :param terms: dict of term name -> function, TERMS if None. A term takes a Position and a side and must
+                      give the side's value less the other side's.
+        """
+        self._terms = dict(TERMS if terms is None else terms)
+        self._weights = {}
+        self._active_terms = []  # (term, weight) for the terms with a weight other than 0
+        self._capacity = max(1, memory_bytes // CACHE_ENTRY_BYTES)
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self.set_weights(DEFAULT_WEIGHTS if weights is None else weights)
+
+    def get_weights(self):
+        """
+        Getter method
+        :return: copy of the dict of term name -> weight
+        """
+        return dict(self._weights)
+
+    def set_weights(self, weights):
+        """
+        Changes the weights, which throws away every cached score. Terms left out get a weight of 0.
+        :param weights: dict of term name -> weight
+        :return: none
+        """
+        unknown = set(weights) - set(self._terms)
+        if unknown:
+            raise ValueError("unknown evaluation terms: " + ', '.join(sorted(unknown)))
+        self._weights = {name: weights.get(name, 0) for name in self._terms}
+        self._active_terms = [(self._terms[name], weight) for name, weight in self._weights.items() if weight]
+        self.clear()
+
+    def get_capacity(self):
+        """
+        Getter method
+        :return: most scores the cache holds
+        """
+        return self._capacity
+
+    def get_stats(self):
+        """
+        Gets the cache numbers
+        :return: dict of hits, misses, evictions, entries and capacity
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                'entries': len(self._cache), 'capacity': self._capacity}
+
+    def clear(self):
+        """
+        Throws away every cached score. The hit and miss counts are kept.
+        :return: none
+        """
+        self._cache.clear()
+
+    def score(self, position):
+        """
+        Adds up the weighted terms without using the cache
+        :param position: the Position to evaluate
+        :return: score for BLACK
+        """
+        return sum(weight * term(position, BLACK) for term, weight in self._active_terms)
+
+    def evaluate(self, position, side):
+        """
+        Evaluates a position, using the cached score if it has been seen before
+        :param position: the Position to evaluate
+        :param side: BLACK or WHITE, the side the score is for
+        :return: score, positive if the side is ahead
+        """
+        key = position.get_hash()
+        if position.get_side_to_move() == WHITE:
+            key ^= ZOBRIST_WHITE_TO_MOVE  # the score doesn't depend on whose turn it is
+        cache = self._cache
+        score = cache.get(key)
+        if score is None:
+            self._misses += 1
+            score = self.score(position)
+            cache[key] = score
+            if len(cache) > self._capacity:
+                cache.popitem(last=False)
+                self._evictions += 1
+        else:
+            self._hits += 1
+            cache.move_to_end(key)
+        return score if side == BLACK else -score
+
+    def evaluate_game(self, game):
+        """
+        Evaluates the position of a game for the player whose turn it is
+        :param game: the GessGame
+        :return: score, positive if the current player is ahead
+        """
+        return self.evaluate(game.get_board().get_position(), game.get_current_player().get_side())
+
+    def __call__(self, position, side):
+        """
+        Lets the Evaluator be passed to SearchEngine as its evaluate function
+        :param position: the Position to evaluate
+        :param side: BLACK or WHITE, the side the score is for
+        :return: score, positive if the side is ahead
+        """
+        return self.evaluate(position, side)
@@ -0,0 +1,236 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: A compact binary format for archiving Gess games. Each game is a small header followed by one
+#              two-byte record per move, and an archive is just games written one after another. GameArchive
+#              memory-maps an archive and reads games lazily, only replaying a game on a board when asked.
+
+import mmap
+import struct
+
+from GessGame import GessGame, BOARD_SIZE, DIRECTIONS, square_index
+
+MAGIC = b'GESS'
+VERSION = 1
+# magic, version, result, number of moves
+HEADER = struct.Struct('<4sBBH')
+MOVE = struct.Struct('<H')
+RESULTS = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+INNER = BOARD_SIZE - 2  # squares per side that can be the center of a piece
+MAX_DISTANCE = INNER - 1  # farthest a piece can slide
+
+
+def encode_move(center, new_center):
+    """
+    Packs a move into a number that fits in two bytes. The center is numbered among the 18x18 squares that can
+    be a center, and the destination is stored as a direction and a distance from it.
+    :param center: square index of the piece's center, row * 20 + column
+    :param new_center: square index the center moves to
+    :return: int from 0 to 44063
+    """
+    row, column = divmod(center, BOARD_SIZE)
+    new_row, new_column = divmod(new_center, BOARD_SIZE)
+    row_change = new_row - row
+    column_change = new_column - column
+    distance = max(abs(row_change), abs(column_change))
+    if distance == 0 or (row_change and column_change and abs(row_change) != abs(column_change)):
+        raise ValueError("not a straight line move: {} to {}".format(center, new_center))
+    direction = DIRECTIONS.index((row_change // distance, column_change // distance))
+    return (((row - 1) * INNER + column - 1) * len(DIRECTIONS) + direction) * MAX_DISTANCE + distance - 1
+
+
+def decode_move(code):
+    """
+    Unpacks a move packed by encode_move
+    :param code: the packed move
+    :return: tuple of (center, new_center) square indexes
+    """
+    code, distance = divmod(code, MAX_DISTANCE)
+    inner_center, direction = divmod(code, len(DIRECTIONS))
+    row, column = divmod(inner_center, INNER)
+    row_step, column_step = DIRECTIONS[direction]
+    center = (row + 1) * BOARD_SIZE + column + 1
+    return center, center + (row_step * BOARD_SIZE + column_step) * (distance + 1)
+
+
+def encode_game(moves, result='UNFINISHED'):
+    """
+    Packs a whole game
+    :param moves: list of (center, new_center) square index tuples
+    :param result: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+    :return: bytes of the header and moves
+    """
+    data = bytearray(HEADER.pack(MAGIC, VERSION, RESULTS.index(result), len(moves)))
+    for center, new_center in moves:
+        data += MOVE.pack(encode_move(center, new_center))
+    return bytes(data)
+
+
+class GameRecordWriter:
+    """
+    Class to represent an archive file being written
+    Responsibilities:
+    Appends games to the file in the binary format
+    Collaborators:
+    none
+    """
+
+    def __init__(self, path, append=True):
+        """
+        Init method to initialize a GameRecordWriter object
+        :param path: path of the archive
+        :param append: if True games are added to the end of an existing archive, otherwise it is replaced
+        """
+        self._file = open(path, 'ab' if append else 'wb')
+
+    def write_game(self, moves, result='UNFINISHED'):
+        """
+        Adds a game to the archive
+        :param moves: list of (center, destination) tuples, either square indexes or coordinates as make_move
+                      takes them, e.g. ('m3', 'm6')
+        :param result: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+        :return: none
+        """
+        squares = []
+        for center, new_center in moves:
+            if isinstance(center, str):
+                center = square_index(center)
+                new_center = square_index(new_center)
+            squares.append((center, new_center))
+        self._file.write(encode_game(squares, result))
+
+    def close(self):
+        """
+        Closes the file
+        :return: none
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class GameRecord:
+    """
+    Class to represent one game in a memory-mapped archive. Nothing is decoded until it is asked for.
+    Responsibilities:
+    Knows the result and number of moves of the game
+    Decodes the moves
+    Replays the game on a board
+    Collaborators:
+    GessGame
+    """
+
+    def __init__(self, data, offset, result, move_count):
+        """
+        Init method to initialize a GameRecord object
+        :param data: memoryview of the archive
+        :param offset: position of the first move record in the archive
+        :param result: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+        :param move_count: number of moves in the game
+        """
+        self._data = data
+        self._offset = offset
+        self._result = result
+        self._move_count = move_count
+
+    def get_result(self):
+        """
+        Getter method
+        :return: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+        """
+        return self._result
+
+    def get_move_count(self):
+        """
+        Getter method
+        :return: number of moves in the game
+        """
+        return self._move_count
+
+    def moves(self):
+        """
+        Generator for the moves of the game
+        :return: yields (center, new_center) square index tuples
+        """
+        data = self._data
+        for offset in range(self._offset, self._offset + self._move_count * MOVE.size, MOVE.size):
+            yield decode_move(MOVE.unpack_from(data, offset)[0])
+
+    def replay(self):
+        """
+        Generator that plays the game from the starting position, reusing one GessGame. The moves are trusted,
+        so they are made with push_move instead of being checked by make_move.
+        :return: yields (number of moves made, GessGame) after each move
+        """
+        game = GessGame()
+        for ply, (center, new_center) in enumerate(self.moves(), 1):
+            game.push_move(center, new_center)
+            yield ply, game
+
+    def game_at(self, ply):
+        """
+        Rebuilds the game after a number of moves
+        :param ply: number of moves to play, 0 for the starting position
+        :return: a new GessGame
+        """
+        game = GessGame()
+        for move_number, (center, new_center) in enumerate(self.moves()):
+            if move_number == ply:
+                break
+            game.push_move(center, new_center)
+        return game
+
+
+class GameArchive:
+    """
+    Class to represent an archive file opened for reading. The file is memory-mapped, so even a very large archive
+    is only read from disk as its games are looked at.
+    Responsibilities:
+    Finds the games in the archive one after another
+    Collaborators:
+    GameRecord
+    """
+
+    def __init__(self, path):
+        """
+        Init method to initialize a GameArchive object
+        :param path: path of the archive
+        """
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, 2)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._data = memoryview(self._mmap) if size else memoryview(b'')
+
+    def __iter__(self):
+        """
+        Generator for the games in the archive
+        :return: yields GameRecord objects
+        """
+        offset = 0
+        data = self._data
+        while offset < len(data):
+            magic, version, result, move_count = HEADER.unpack_from(data, offset)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("not a Gess game record at byte {}".format(offset))
+            offset += HEADER.size
+            yield GameRecord(data, offset, RESULTS[result], move_count)
+            offset += move_count * MOVE.size
+
+    def close(self):
+        """
+        Closes the archive. GameRecords from it can't be used after this.
+        :return: none
+        """
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,204 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: Move history for reviewing Gess games. Every move is kept as a small delta of the squares it changed,
+#              and a full snapshot of the game is kept every few moves. Since a delta is an XOR of the stones, it
+#              can be applied going forward or backward, so undo, redo and jumping to any move start from the
+#              current move or the nearest snapshot and never apply more deltas than the snapshot interval.
+
+from GessGame import GessGame, BLACK, WHITE, square_index
+
+
+class MoveDelta:
+    """
+    Class to represent what one move changed
+    Responsibilities:
+    Knows the move, the side that made it and the squares that changed for each side
+    Knows how many stones were captured and how many of the mover's own stones were removed
+    Knows the ring counts before and after the move and the state of the game after it
+    Collaborators:
+    none
+    """
+    __slots__ = ('center', 'new_center', 'side', 'black_changed', 'white_changed', 'captured', 'cleared',
+                 'rings_before', 'rings_after', 'state_after')
+
+    def __init__(self, center, new_center, side, black_changed, white_changed, captured, cleared, rings_before,
+                 rings_after, state_after):
+        """
+        Init method to initialize a MoveDelta object
+        :param center: square index of the center of the piece moved
+        :param new_center: square index the center moved to
+        :param side: BLACK or WHITE, the side that moved
+        :param black_changed: bitboard of the squares whose black stone appeared or disappeared
+        :param white_changed: bitboard of the squares whose white stone appeared or disappeared
+        :param captured: number of opposing stones removed
+        :param cleared: number of the mover's stones removed, from the edge or from under the new footprint
+        :param rings_before: tuple of the black and white ring counts before the move
+        :param rings_after: tuple of the black and white ring counts after the move
+        :param state_after: state of the game after the move
+        """
+        self.center = center
+        self.new_center = new_center
+        self.side = side
+        self.black_changed = black_changed
+        self.white_changed = white_changed
+        self.captured = captured
+        self.cleared = cleared
+        self.rings_before = rings_before
+        self.rings_after = rings_after
+        self.state_after = state_after
+
+
+class GameHistory:
+    """
+    Class to represent the moves of a game, with a cursor that can be moved back and forth through them
+    Responsibilities:
+    Makes moves on its game and records them as MoveDeltas
+    Keeps a snapshot of the game every checkpoint_interval moves
+    Undoes, redoes and jumps to any move, changing the game to match
+    Collaborators:
+    GessGame
+    MoveDelta
+    """
+
+    def __init__(self, game=None, checkpoint_interval=32):
+        """
+        Init method to initialize a GameHistory object. The history starts from the game's current position.
+        :param game: GessGame the moves are made on, a new game if None
+        :param checkpoint_interval: number of moves between snapshots
+        """
+        self._game = game if game is not None else GessGame()
+        self._interval = checkpoint_interval
+        self._deltas = []
+        self._ply = 0
+        position = self._game.get_board().get_position()
+        self._stones = [position.get_stones(BLACK), position.get_stones(WHITE)]
+        # snapshots at moves 0, K, 2K, ... along with the stones at that move
+        self._checkpoints = [(self._game.snapshot(), self._stones[BLACK], self._stones[WHITE])]
+        self._start_side = self._game.get_current_player().get_side()
+        self._start_state = self._game.get_game_state()
+
+    def get_game(self):
+        """
+        Getter method
+        :return: the GessGame
+        """
+        return self._game
+
+    def get_ply(self):
+        """
+        Getter method
+        :return: number of moves from the start the game is at
+        """
+        return self._ply
+
+    def get_length(self):
+        """
+        Getter method
+        :return: number of moves recorded, including ones that were undone and can be redone
+        """
+        return len(self._deltas)
+
+    def get_delta(self, ply):
+        """
+        Getter method
+        :param ply: number of the move, 0 for the first
+        :return: the MoveDelta of the move
+        """
+        return self._deltas[ply]
+
+    def moves(self):
+        """
+        Lists the moves up to the cursor
+        :return: list of (center, new_center) square index tuples
+        """
+        return [(delta.center, delta.new_center) for delta in self._deltas[:self._ply]]
+
+    def make_move(self, center, new_center):
+        """
+        Makes a move on the game and records it. Moves after the cursor that were undone are dropped.
+        :param center: square index or coordinate, e.g. 'm3', of the center of the piece
+        :param new_center: square index or coordinate the center moves to
+        :return: True if the move was legal and was made, False otherwise
+        """
+        if isinstance(center, str):
+            try:
+                center = square_index(center)
+                new_center = square_index(new_center)
+            except ValueError:
+                return False
+        game = self._game
+        position = game.get_board().get_position()
+        side = game.get_current_player().get_side()
+        rings_before = (position.get_ring_count(BLACK), position.get_ring_count(WHITE))
+        if not game.make_move_at(center, new_center):
+            return False
+        black_stones = position.get_stones(BLACK)
+        white_stones = position.get_stones(WHITE)
+        delta = MoveDelta(center, new_center, side, self._stones[BLACK] ^ black_stones,
+                          self._stones[WHITE] ^ white_stones,
+                          self._stones[1 - side].bit_count() - position.get_stones(1 - side).bit_count(),
+                          self._stones[side].bit_count() - position.get_stones(side).bit_count(),
+                          rings_before, (position.get_ring_count(BLACK), position.get_ring_count(WHITE)),
+                          game.get_game_state())
+        del self._deltas[self._ply:]
+        del self._checkpoints[self._ply // self._interval + 1:]
+        self._deltas.append(delta)
+        self._ply += 1
+        self._stones[BLACK] = black_stones
+        self._stones[WHITE] = white_stones
+        if self._ply % self._interval == 0:
+            self._checkpoints.append((game.snapshot(), black_stones, white_stones))
+        return True
+
+    def undo(self):
+        """
+        Takes back the move before the cursor
+        :return: True if a move was taken back, False at the start of the game
+        """
+        if self._ply == 0:
+            return False
+        self.seek(self._ply - 1)
+        return True
+
+    def redo(self):
+        """
+        Makes the move after the cursor again
+        :return: True if a move was made again, False if there is none
+        """
+        if self._ply == len(self._deltas):
+            return False
+        self.seek(self._ply + 1)
+        return True
+
+    def seek(self, ply):
+        """
+        Changes the game to how it was after a number of moves, starting from whichever of the current move and
+        the nearest snapshot is closer
+        :param ply: number of moves from the start, from 0 to get_length()
+        :return: none
+        """
+        if not 0 <= ply <= len(self._deltas):
+            raise IndexError("no move {} in a history of {} moves".format(ply, len(self._deltas)))
+        checkpoint = min((ply + self._interval // 2) // self._interval, len(self._checkpoints) - 1)
+        if abs(checkpoint * self._interval - ply) < abs(self._ply - ply):
+            snapshot, black_stones, white_stones = self._checkpoints[checkpoint]
+            if checkpoint * self._interval == ply:
+                self._game.restore(snapshot)
+                self._stones = [black_stones, white_stones]
+                self._ply = ply
+                return
+            start = checkpoint * self._interval
+        else:
+            black_stones, white_stones = self._stones
+            start = self._ply
+        for delta in self._deltas[min(start, ply):max(start, ply)]:
+            black_stones ^= delta.black_changed
+            white_stones ^= delta.white_changed
+        if ply == 0:
+            side, state = self._start_side, self._start_state
+        else:
+            delta = self._deltas[ply - 1]
+            side, state = 1 - delta.side, delta.state_after
+        self._game.load_position(black_stones, white_stones, side, state)
+        self._stones = [black_stones, white_stones]
+        self._ply = ply
@@ -0,0 +1,274 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: Opt-in instrumentation of the Gess rule functions. While an Instrumentation is enabled, the methods
+#              listed in INSTRUMENTED are replaced by wrappers that count calls, time them into latency histograms
+#              and count the memory blocks they leave allocated. Disabling it puts the original methods back, so
+#              nothing is slowed down while it is off.
+#              Usage:
+#                with Instrumentation() as instrumentation:
+#                    ...play or search...
+#                print(instrumentation.report())
+
+import functools
+import inspect
+import json
+import sys
+import time
+
+from GessGame import GessGame, Board, Position
+
+# (class, method name) of every instrumented method. The string methods hand off to the square-index ones and
+# the Board methods to the Position ones, so a call is also counted under every method it goes through, e.g. a call
+# to make_move shows up under make_move_at as well.
+INSTRUMENTED = (
+    (GessGame, 'make_move'),
+    (GessGame, 'make_move_at'),
+    (GessGame, 'identify_rings'),
+    (Board, 'possible_moves'),
+    (Board, 'possible_squares'),
+    (Board, 'generate_all_moves'),
+    (Board, 'is_a_piece'),
+    (Board, 'is_a_piece_at'),
+    (Board, 'move_piece'),
+    (Board, 'move_piece_at'),
+    (Position, 'generate_moves'),
+    (Position, 'piece_moves'),
+    (Position, 'keeps_ring'),
+    (Position, 'keeps_ring_moves'),
+    (Position, 'move_piece'),
+)
+# a call goes in bucket n of a histogram when it took less than 2**n microseconds, the last bucket has the rest
+HISTOGRAM_BUCKETS = 24
+
+
+class FunctionStats:
+    """
+    Class to represent the numbers collected for one method
+    Responsibilities:
+    Counts calls, total and longest time, and memory blocks left allocated
+    Keeps a histogram of how long the calls took
+    Collaborators:
+    none
+    """
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'allocated_blocks', 'histogram')
+
+    def __init__(self):
+        """
+        Init method to initialize a FunctionStats object with nothing recorded
+        """
+        self.reset()
+
+    def reset(self):
+        """
+        Throws away everything recorded
+        :return: none
+        """
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.allocated_blocks = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, elapsed_ns, allocated_blocks):
+        """
+        Adds one call
+        :param elapsed_ns: nanoseconds the call took
+        :param allocated_blocks: change in the number of allocated memory blocks over the call
+        :return: none
+        """
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.allocated_blocks += allocated_blocks
+        self.histogram[min((elapsed_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """
+        Estimates a latency percentile from the histogram
+        :param fraction: e.g. 0.99 for the 99th percentile
+        :return: upper bound in microseconds of the bucket the percentile falls in, 0 with no calls
+        """
+        if not self.calls:
+            return 0
+        target = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target:
+                return 2 ** bucket
+        return 2 ** (HISTOGRAM_BUCKETS - 1)
+
+    def to_dict(self):
+        """
+        Converts the numbers to a dict that can be written as JSON
+        :return: dict of the counts, times in microseconds and the histogram
+        """
+        return {
+            'calls': self.calls,
+            'total_us': self.total_ns / 1000,
+            'mean_us': self.total_ns / 1000 / self.calls if self.calls else 0.0,
+            'max_us': self.max_ns / 1000,
+            'p50_us': self.percentile(0.5),
+            'p99_us': self.percentile(0.99),
+            'allocated_blocks': self.allocated_blocks,
+            'histogram_us': {str(2 ** bucket): count for bucket, count in enumerate(self.histogram) if count},
+        }
+
+
+class Instrumentation:
+    """
+    Class to represent a recording of how the rule functions are being used. Only one Instrumentation can be
+    enabled at a time, since enabling one replaces methods on the GessGame and Board classes.
+    Responsibilities:
+    Wraps the methods in INSTRUMENTED while enabled and restores them when disabled
+    Keeps a FunctionStats for each method
+    Exports the numbers as JSON or a text report, and can start over
+    Collaborators:
+    FunctionStats
+    GessGame
+    Board
+    """
+    _enabled = None  # the Instrumentation whose wrappers are on the classes, if any
+
+    def __init__(self, methods=INSTRUMENTED):
+        """
+        Init method to initialize an Instrumentation object, which starts out disabled
+        :param methods: (class, method name) tuples of the methods to instrument
+        """
+        self._methods = tuple(methods)
+        self._stats = {self._name(cls, name): FunctionStats() for cls, name in self._methods}
+        self._originals = {}
+
+    @staticmethod
+    def _name(cls, name):
+        """
+        Builds the name the numbers of a method are kept under
+        :param cls: class the method is on
+        :param name: name of the method
+        :return: e.g. 'GessGame.make_move'
+        """
+        return cls.__name__ + '.' + name
+
+    def is_enabled(self):
+        """
+        Getter method
+        :return: True if the methods are being recorded, False otherwise
+        """
+        return Instrumentation._enabled is self
+
+    def enable(self):
+        """
+        Starts recording by putting wrappers in place of the methods
+        :return: none
+        """
+        if Instrumentation._enabled is self:
+            return
+        if Instrumentation._enabled is not None:
+            raise RuntimeError("another Instrumentation is already enabled")
+        for cls, name in self._methods:
+            original = cls.__dict__[name]
+            self._originals[cls, name] = original
+            setattr(cls, name, self._wrap(original, self._stats[self._name(cls, name)]))
+        Instrumentation._enabled = self
+
+    def disable(self):
+        """
+        Stops recording and puts the original methods back. The numbers are kept.
+        :return: none
+        """
+        if Instrumentation._enabled is not self:
+            return
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+        Instrumentation._enabled = None
+
+    @staticmethod
+    def _wrap(function, stats):
+        """
+        Builds the wrapper that records the calls of a method. For a generator, such as generate_moves, one call
+        covers running it to the end, timing only the steps of the generator and not the code using its values.
+        :param function: the original method
+        :param stats: FunctionStats to record into
+        :return: the wrapper
+        """
+        perf_counter_ns = time.perf_counter_ns
+        allocated_blocks = sys.getallocatedblocks
+
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                generator = function(*args, **kwargs)
+                elapsed = 0
+                blocks = 0
+                try:
+                    while True:
+                        blocks -= allocated_blocks()
+                        start = perf_counter_ns()
+                        try:
+                            value = next(generator)
+                        except StopIteration:
+                            return
+                        finally:
+                            elapsed += perf_counter_ns() - start
+                            blocks += allocated_blocks()
+                        yield value
+                finally:
+                    generator.close()
+                    stats.record(elapsed, blocks)
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            blocks = allocated_blocks()
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.record(perf_counter_ns() - start, allocated_blocks() - blocks)
+        return wrapper
+
+    def reset(self):
+        """
+        Throws away everything recorded so far, e.g. between games or searches
+        :return: none
+        """
+        for stats in self._stats.values():
+            stats.reset()
+
+    def get_stats(self):
+        """
+        Gets the numbers of every method that was called
+        :return: dict of method name -> dict from FunctionStats.to_dict
+        """
+        return {name: stats.to_dict() for name, stats in self._stats.items() if stats.calls}
+
+    def to_json(self, indent=None):
+        """
+        Exports the numbers as JSON
+        :param indent: indent passed on to json.dumps
+        :return: JSON string of get_stats
+        """
+        return json.dumps(self.get_stats(), indent=indent)
+
+    def report(self):
+        """
+        Builds a flat text report with one line per method that was called, slowest total first
+        :return: the report
+        """
+        lines = ["{:28s} {:>9s} {:>11s} {:>9s} {:>9s} {:>9s} {:>9s} {:>10s}".format(
+            'method', 'calls', 'total ms', 'mean us', 'p50 us', 'p99 us', 'max us', 'blocks')]
+        stats = sorted(self.get_stats().items(), key=lambda item: item[1]['total_us'], reverse=True)
+        for name, numbers in stats:
+            lines.append("{:28s} {:9d} {:11.2f} {:9.2f} {:9d} {:9d} {:9.1f} {:10d}".format(
+                name, numbers['calls'], numbers['total_us'] / 1000, numbers['mean_us'], numbers['p50_us'],
+                numbers['p99_us'], numbers['max_us'], numbers['allocated_blocks']))
+        return '\n'.join(lines)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
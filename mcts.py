@@ -0,0 +1,327 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: A Monte Carlo Tree Search player for Gess. Each worker process grows its own UCT tree from the same
+#              position and the visit counts of the root moves are added together to pick a move. Playouts are run
+#              on a copy of the Position instead of a whole GessGame.
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from GessGame import Position, FOOTPRINT, bitboard_squares
+
+
+def random_playout_move(position, side, rng, tries=32):
+    """
+    Playout policy that picks a random piece and then a random move of that piece, falling back to listing every
+    legal move if no legal move turns up after a few tries
+    :param position: Position to move in
+    :param side: BLACK or WHITE, the side moving
+    :param rng: random.Random to use
+    :param tries: number of random picks before falling back
+    :return: (center, new_center) tuple, or None if the side has no legal move
+    """
+    centers = bitboard_squares(position.piece_centers(side))
+    if centers:
+        for attempt in range(tries):
+            center = rng.choice(centers)
+            moves = position.piece_moves(center, side)
+            if moves:
+                new_center = rng.choice(moves)
+                if position.keeps_ring(center, new_center, side):
+                    return center, new_center
+    moves = list(position.generate_moves(side))
+    if moves:
+        return rng.choice(moves)
+    return None
+
+
+def capture_playout_move(position, side, rng, samples=8):
+    """
+    Playout policy that looks at a few random moves and plays the one capturing the most opposing stones
+    :param position: Position to move in
+    :param side: BLACK or WHITE, the side moving
+    :param rng: random.Random to use
+    :param samples: number of random moves to compare
+    :return: (center, new_center) tuple, or None if the side has no legal move
+    """
+    opposing = position.get_stones(1 - side)
+    best_move = None
+    best_captured = -1
+    for sample in range(samples):
+        move = random_playout_move(position, side, rng)
+        if move is None:
+            return None
+        captured = (opposing & FOOTPRINT[move[1]]).bit_count()
+        if captured > best_captured:
+            best_move = move
+            best_captured = captured
+    return best_move
+
+
+PLAYOUT_POLICIES = {'random': random_playout_move, 'capture': capture_playout_move}
+
+
+class Node:
+    """
+    Class to represent a node of a search tree
+    Responsibilities:
+    Knows the move that led to it and the side that made it
+    Keeps up with how often it was visited and how often the side that moved into it won
+    Has the moves that haven't been tried from it yet
+    Collaborators:
+    none
+    """
+    __slots__ = ('move', 'side', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, side, parent):
+        """
+        Init method to initialize a Node object
+        :param move: (center, new_center) tuple that led to this node, None for the root
+        :param side: BLACK or WHITE, the side that made the move
+        :param parent: parent Node, None for the root
+        """
+        self.move = move
+        self.side = side
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        """
+        Picks the child with the best upper confidence bound (UCT)
+        :param exploration: how much less visited children are favored
+        :return: the child Node
+        """
+        log_visits = math.log(self.visits)
+        best_child = None
+        best_value = -1.0
+        for child in self.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_child = child
+                best_value = value
+        return best_child
+
+
+def playout(position, side, rng, policy, max_moves):
+    """
+    Plays random moves on the position until a side runs out of rings or can't move, or max_moves are played,
+    in which case the side with more stones wins
+    :param position: Position to play on, it is changed
+    :param side: BLACK or WHITE, the side to move
+    :param rng: random.Random to use
+    :param policy: function picking a move, see random_playout_move
+    :param max_moves: most moves to play
+    :return: BLACK or WHITE for the winner, or None for a draw
+    """
+    for move_number in range(max_moves):
+        move = policy(position, side, rng)
+        if move is None:
+            return 1 - side
+        position.move_piece(move[0], move[1], side)
+        if position.get_ring_count(1 - side) == 0:
+            return side
+        side = 1 - side
+    difference = position.get_stones(side).bit_count() - position.get_stones(1 - side).bit_count()
+    if difference > 0:
+        return side
+    if difference < 0:
+        return 1 - side
+    return None
+
+
+def grow_tree(black_stones, white_stones, side, time_limit, iterations, seed, exploration=1.4, policy='random',
+              max_playout_moves=60):
+    """
+    Grows one search tree. This runs in the worker processes, so it takes plain ints instead of a GessGame.
+    :param black_stones: bitboard of the black stones
+    :param white_stones: bitboard of the white stones
+    :param side: BLACK or WHITE, the side to move
+    :param time_limit: seconds to search for, or None to only stop after iterations
+    :param iterations: most playouts to run, or None to only stop after time_limit
+    :param seed: seed for the random numbers of this tree
+    :param exploration: UCT exploration constant
+    :param policy: name of the playout policy, see PLAYOUT_POLICIES
+    :param max_playout_moves: most moves in a playout
+    :return: tuple of a dict of root move -> (visits, wins) and the number of playouts run
+    """
+    rng = random.Random(seed)
+    policy = PLAYOUT_POLICIES[policy]
+    position = Position(black_stones, white_stones)
+    position.set_side_to_move(side)
+    root = Node(None, 1 - side, None)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    playouts = 0
+    while (iterations is None or playouts < iterations) and (deadline is None or time.perf_counter() < deadline):
+        node = root
+        moving_side = side
+        depth = 0
+        winner = -1
+        # selection
+        while node.untried is not None and not node.untried and node.children:
+            node = node.select_child(exploration)
+            position.push_move(node.move[0], node.move[1], moving_side)
+            depth += 1
+            moving_side = 1 - moving_side
+        if node.move is not None and position.get_ring_count(moving_side) == 0:
+            winner = node.side
+        else:
+            # expansion
+            if node.untried is None:
+                node.untried = list(position.generate_moves(moving_side))
+                rng.shuffle(node.untried)
+                if not node.untried and not node.children:
+                    winner = 1 - moving_side
+            if winner == -1 and node.untried:
+                move = node.untried.pop()
+                position.push_move(move[0], move[1], moving_side)
+                depth += 1
+                child = Node(move, moving_side, node)
+                node.children.append(child)
+                node = child
+                moving_side = 1 - moving_side
+                if position.get_ring_count(moving_side) == 0:
+                    winner = node.side
+            if winner == -1:
+                winner = playout(position.copy(), moving_side, rng, policy, max_playout_moves)
+        # back propagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.side:
+                node.wins += 1.0
+            elif winner is None:
+                node.wins += 0.5
+            node = node.parent
+        for i in range(depth):
+            position.pop_move()
+        playouts += 1
+    return {child.move: (child.visits, child.wins) for child in root.children}, playouts
+
+
+class MCTSPlayer:
+    """
+    Class to represent a computer player using Monte Carlo Tree Search with root parallelism
+    Responsibilities:
+    Grows an independent tree in each worker process
+    Adds up the visit counts of the root moves and plays the most visited move
+    Collaborators:
+    GessGame
+    Position
+    """
+
+    def __init__(self, workers=None, time_limit=1.0, iterations=None, exploration=1.4, policy='random',
+                 max_playout_moves=60, seed=None):
+        """
+        Init method to initialize an MCTSPlayer object
+        :param workers: number of processes, every core if None
+        :param time_limit: seconds to search for each move, or None to only stop after iterations
+        :param iterations: most playouts per worker, or None to only stop after time_limit
+        :param exploration: UCT exploration constant
+        :param policy: name of the playout policy, 'random' or 'capture'
+        :param max_playout_moves: most moves in a playout
+        :param seed: seed for the random numbers, different every search if None
+        """
+        self._workers = workers or os.cpu_count() or 1
+        self._time_limit = time_limit
+        self._iterations = iterations
+        self._exploration = exploration
+        self._policy = policy
+        self._max_playout_moves = max_playout_moves
+        self._rng = random.Random(seed)
+        self._executor = None
+        self._playouts = 0
+
+    def get_playouts(self):
+        """
+        Getter method
+        :return: number of playouts run by all workers in the last search
+        """
+        return self._playouts
+
+    def close(self):
+        """
+        Shuts down the worker processes
+        :return: none
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search(self, game):
+        """
+        Searches the current position of a game with every worker
+        :param game: GessGame to search
+        :return: dict of root move as (center, new_center) square indexes -> (visits, wins) added over all trees
+        """
+        position = game.get_board().get_position()
+        side = game.get_current_player().get_side()
+        jobs = [(position.get_stones(0), position.get_stones(1), side, self._time_limit, self._iterations,
+                 self._rng.getrandbits(32), self._exploration, self._policy, self._max_playout_moves)
+                for worker in range(self._workers)]
+        if self._workers == 1:
+            results = [grow_tree(*jobs[0])]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self._workers)
+            results = list(self._executor.map(grow_tree, *zip(*jobs)))
+        totals = {}
+        self._playouts = 0
+        for root_moves, playouts in results:
+            self._playouts += playouts
+            for move, (visits, wins) in root_moves.items():
+                total_visits, total_wins = totals.get(move, (0, 0.0))
+                totals[move] = (total_visits + visits, total_wins + wins)
+        return totals
+
+    def choose_move(self, game):
+        """
+        Finds the most visited move for the current player
+        :param game: GessGame to search
+        :return: tuple of the center and destination coordinates, e.g. ('m3', 'm6'), or None if there is no legal move
+        """
+        totals = self.search(game)
+        if not totals:
+            return None
+        best_move = max(totals, key=lambda move: totals[move][0])
+        board = game.get_board()
+        return board.get_coordinate(best_move[0]), board.get_coordinate(best_move[1])
+
+
+def measure_scaling(game, worker_counts=None, time_limit=1.0, policy='random'):
+    """
+    Measures how the number of playouts grows with the number of workers
+    :param game: GessGame to search
+    :param worker_counts: list of worker counts to try, powers of two up to the number of cores if None
+    :param time_limit: seconds each search takes
+    :param policy: name of the playout policy
+    :return: list of dicts with the workers, playouts, playouts per second and speedup over the first count
+    """
+    if worker_counts is None:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+    report = []
+    for workers in worker_counts:
+        player = MCTSPlayer(workers=workers, time_limit=time_limit, policy=policy, seed=workers)
+        # the first search starts the worker processes, so it isn't timed
+        player.search(game)
+        start = time.perf_counter()
+        player.search(game)
+        elapsed = time.perf_counter() - start
+        player.close()
+        rate = player.get_playouts() / elapsed
+        report.append({'workers': workers, 'playouts': player.get_playouts(), 'playouts_per_second': rate,
+                       'speedup': rate / report[0]['playouts_per_second'] if report else 1.0})
+    return report
+
+
+if __name__ == '__main__':
+    from GessGame import GessGame
+    for line in measure_scaling(GessGame()):
+        print("workers: {workers:3d}  playouts: {playouts:7d}  playouts/s: {playouts_per_second:9.1f}  "
+              "speedup: {speedup:5.2f}".format(**line))
@@ -0,0 +1,216 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: An opening book for Gess built from archived games. The builder replays the first moves of every game
+#              in one or more game record archives and counts how often each move was played from each position and
+#              how those games ended. The counts are written as a table sorted by position hash, which OpeningBook
+#              memory-maps and binary-searches, so opening a book costs nothing up front and every process using
+#              the same book shares one copy of it through the page cache.
+#              Usage: python opening_book.py build ARCHIVE [ARCHIVE ...] --output book.bin [--plies 20]
+#                     python opening_book.py show book.bin
+
+import argparse
+import mmap
+import struct
+
+from GessGame import GessGame, square_name
+from game_record import GameArchive, encode_move, decode_move
+
+MAGIC = b'GBOK'
+VERSION = 1
+# magic, version, number of entries
+HEADER = struct.Struct('<4sBI')
+# position hash, packed move (see game_record.encode_move), games, wins and losses for the side that moved
+ENTRY = struct.Struct('<QHIII')
+KEY = struct.Struct('<Q')
+
+
+def gather_moves(archive_paths, plies=20):
+    """
+    Counts the moves played in the opening of every game in the archives
+    :param archive_paths: paths of game record archives
+    :param plies: number of moves from the start of each game to count
+    :return: dict of (position hash, packed move) -> [games, wins, losses] for the side that moved
+    """
+    stats = {}
+    for path in archive_paths:
+        with GameArchive(path) as archive:
+            for record in archive:
+                result = record.get_result()
+                game = GessGame()
+                position = game.get_board().get_position()
+                for ply, (center, new_center) in enumerate(record.moves()):
+                    if ply == plies:
+                        break
+                    key = (position.get_hash(), encode_move(center, new_center))
+                    counts = stats.get(key)
+                    if counts is None:
+                        counts = stats[key] = [0, 0, 0]
+                    counts[0] += 1
+                    if result != 'UNFINISHED':
+                        winner = result[:-len('_WON')]
+                        counts[1 if winner == game.get_current_player().get_team() else 2] += 1
+                    game.push_move(center, new_center)
+    return stats
+
+
+def write_book(stats, path, min_games=1):
+    """
+    Writes move counts to a book file, sorted by position hash and then move
+    :param stats: dict from gather_moves
+    :param path: path of the book file
+    :param min_games: moves played in fewer games than this are left out
+    :return: number of entries written
+    """
+    entries = sorted((key, counts) for key, counts in stats.items() if counts[0] >= min_games)
+    with open(path, 'wb') as book_file:
+        book_file.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+        for (position_hash, move), (games, wins, losses) in entries:
+            book_file.write(ENTRY.pack(position_hash, move, games, wins, losses))
+    return len(entries)
+
+
+def build_book(archive_paths, path, plies=20, min_games=1):
+    """
+    Builds a book file from game record archives
+    :param archive_paths: paths of game record archives
+    :param path: path of the book file
+    :param plies: number of moves from the start of each game to count
+    :param min_games: moves played in fewer games than this are left out
+    :return: number of entries written
+    """
+    return write_book(gather_moves(archive_paths, plies), path, min_games)
+
+
+class OpeningBook:
+    """
+    Class to represent a book file opened for lookups. The file is memory-mapped and nothing is read until a
+    position is looked up.
+    Responsibilities:
+    Finds the book moves of a position by binary search on its hash
+    Picks the book move with the best results
+    Collaborators:
+    Position
+    """
+
+    def __init__(self, path):
+        """
+        Init method to initialize an OpeningBook object
+        :param path: path of the book file
+        """
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("not a Gess opening book: " + path)
+
+    def get_size(self):
+        """
+        Getter method
+        :return: number of entries in the book
+        """
+        return self._size
+
+    def lookup(self, position_hash):
+        """
+        Finds the book moves of a position
+        :param position_hash: Zobrist hash of the position, from Position.get_hash
+        :return: list of ((center, new_center), games, wins, losses) tuples, empty if the position isn't in the book
+        """
+        data = self._mmap
+        low = 0
+        high = self._size
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(data, HEADER.size + middle * ENTRY.size)[0] < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        offset = HEADER.size + low * ENTRY.size
+        end = HEADER.size + self._size * ENTRY.size
+        while offset < end:
+            key, move, games, wins, losses = ENTRY.unpack_from(data, offset)
+            if key != position_hash:
+                break
+            moves.append((decode_move(move), games, wins, losses))
+            offset += ENTRY.size
+        return moves
+
+    def best_move(self, position, min_games=1):
+        """
+        Picks the book move with the best results for the side to move, counting unfinished games as half a win.
+        Moves that aren't legal in the position are skipped, in case two positions share a hash.
+        :param position: the Position
+        :param min_games: moves played in fewer games than this are skipped
+        :return: (center, new_center) tuple of square indexes, or None if the book has no move for the position
+        """
+        side = position.get_side_to_move()
+        best = None
+        best_key = None
+        for (center, new_center), games, wins, losses in self.lookup(position.get_hash()):
+            if games < min_games or not position.is_a_piece(center, side) or \
+                    new_center not in position.piece_moves(center, side) or \
+                    not position.keeps_ring(center, new_center, side):
+                continue
+            key = ((games + wins - losses) / (2 * games), games)
+            if best_key is None or key > best_key:
+                best = (center, new_center)
+                best_key = key
+        return best
+
+    def choose_move(self, game):
+        """
+        Picks the book move for the current player of a game
+        :param game: the GessGame
+        :return: tuple of the center and destination coordinates, or None if the book has no move
+        """
+        move = self.best_move(game.get_board().get_position())
+        if move is None:
+            return None
+        return square_name(move[0]), square_name(move[1])
+
+    def close(self):
+        """
+        Closes the book
+        :return: none
+        """
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """
+    Builds a book or shows the book moves of the starting position from the command line
+    :return: none
+    """
+    parser = argparse.ArgumentParser(description="Gess opening book")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build a book from game record archives")
+    build.add_argument('archives', nargs='+')
+    build.add_argument('--output', default='book.bin')
+    build.add_argument('--plies', type=int, default=20)
+    build.add_argument('--min-games', type=int, default=1)
+    show = commands.add_parser('show', help="show the book moves of the starting position")
+    show.add_argument('book')
+    args = parser.parse_args()
+    if args.command == 'build':
+        count = build_book(args.archives, args.output, args.plies, args.min_games)
+        print("wrote {} entries to {}".format(count, args.output))
+        return
+    with OpeningBook(args.book) as book:
+        position = GessGame().get_board().get_position()
+        print("{} entries".format(book.get_size()))
+        for (center, new_center), games, wins, losses in book.lookup(position.get_hash()):
+            print("{:>4s}-{:<4s} {:8d} games {:8d} wins {:8d} losses".format(
+                square_name(center), square_name(new_center), games, wins, losses))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: Perft (performance test) for the Gess move generator. perft counts every leaf of the tree of legal
+#              moves to a given depth, and check_positions compares the counts for the starting position and a set
+#              of saved positions against known good numbers. Run this file to check them all.
+
+import sys
+import time
+
+from GessGame import GessGame, BLACK, WHITE, square_index
+
+# Saved positions that are easy to get wrong, given as the coordinates of the black and white stones and the side
+# to move. Each keeps a ring for both sides so the game isn't over before it starts.
+SAVED_POSITIONS = {
+    # pieces on columns b and s and rows 2 and 19 that can capture stones and push their own off the edge
+    'edge_captures': (
+        'j9 k9 l9 j11 k11 l11 j10 l10 b2 c2 c3 b4 r19 s19 s18',
+        'j15 k15 l15 j17 k17 l17 j16 l16 d3 d4 b6 c6 q18 r17 s16',
+        'BLACK'),
+    # both sides have three rings, two of them sharing stones, so breaking one still leaves a legal move
+    'multi_ring': (
+        'f9 g9 h9 i9 j9 f10 h10 j10 f11 g11 h11 i11 j11 o6 p6 q6 o7 q7 o8 p8 q8',
+        'f14 g14 h14 i14 j14 f15 h15 j15 f16 g16 h16 i16 j16 o13 p13 q13 o14 q14 o15 p15 q15',
+        'WHITE'),
+    # black's only stones make up its single ring, so most moves would leave it without one
+    'last_ring': (
+        'j9 k9 l9 j11 k11 l11 j10 l10 m10 n10',
+        'j15 k15 l15 j17 k17 l17 j16 l16 k13 k12',
+        'BLACK'),
+}
+
+# perft counts at depths 1, 2 and 3, checked against a separate slow implementation of the rules. The starting
+# position and multi_ring only go to depth 2 since their depth 3 trees have millions of leaves.
+EXPECTED_COUNTS = {
+    'start': [319, 101761],
+    'edge_captures': [34, 2155, 78992],
+    'multi_ring': [262, 73772],
+    'last_ring': [23, 757, 27012],
+}
+
+
+def load_position(black_coordinates, white_coordinates, side_to_move):
+    """
+    Creates a game with the given stones on the board
+    :param black_coordinates: coordinates of the black stones separated by spaces, e.g. 'c2 e2'
+    :param white_coordinates: coordinates of the white stones separated by spaces
+    :param side_to_move: 'BLACK' or 'WHITE'
+    :return: the GessGame
+    """
+    stones = []
+    for coordinates in (black_coordinates, white_coordinates):
+        mask = 0
+        for coordinate in coordinates.split():
+            mask |= 1 << square_index(coordinate)
+        stones.append(mask)
+    game = GessGame()
+    game.load_position(stones[BLACK], stones[WHITE], WHITE if side_to_move == 'WHITE' else BLACK)
+    return game
+
+
+def perft(depth, game=None):
+    """
+    Counts the leaves of the tree of legal moves. A game that is over has no moves, so it only counts as a leaf
+    at depth 0.
+    :param depth: number of moves to look ahead
+    :param game: GessGame to start from, the starting position if None. It is left as it was found.
+    :return: number of leaves
+    """
+    if game is None:
+        game = GessGame()
+    if depth == 0:
+        return 1
+    if game.get_game_state() != 'UNFINISHED':
+        return 0
+    position = game.get_board().get_position()
+    moves = position.generate_moves(game.get_current_player().get_side())
+    if depth == 1:
+        return sum(1 for move in moves)
+    nodes = 0
+    for center, new_center in list(moves):
+        game.push_move(center, new_center)
+        nodes += perft(depth - 1, game)
+        game.pop_move()
+    return nodes
+
+
+def divide(depth, game=None):
+    """
+    Perft split up by the first move, for finding which move a wrong count comes from
+    :param depth: number of moves to look ahead, at least 1
+    :param game: GessGame to start from, the starting position if None
+    :return: dict of (center, destination) coordinates -> number of leaves
+    """
+    if game is None:
+        game = GessGame()
+    board = game.get_board()
+    counts = {}
+    for center, new_center in list(board.get_position().generate_moves(game.get_current_player().get_side())):
+        game.push_move(center, new_center)
+        counts[board.get_coordinate(center), board.get_coordinate(new_center)] = perft(depth - 1, game)
+        game.pop_move()
+    return counts
+
+
+def make_game(name):
+    """
+    Creates the game for a named test position
+    :param name: 'start' or a key of SAVED_POSITIONS
+    :return: the GessGame
+    """
+    if name == 'start':
+        return GessGame()
+    return load_position(*SAVED_POSITIONS[name])
+
+
+def check_positions(max_depth=3):
+    """
+    Runs perft on every test position and compares the counts with EXPECTED_COUNTS
+    :param max_depth: deepest perft to run
+    :return: list of (name, depth, expected, found) tuples for the counts that are wrong
+    """
+    mismatches = []
+    for name in EXPECTED_COUNTS:
+        for depth, expected in enumerate(EXPECTED_COUNTS[name][:max_depth], 1):
+            found = perft(depth, make_game(name))
+            if found != expected:
+                mismatches.append((name, depth, expected, found))
+    return mismatches
+
+
+def main():
+    """
+    Checks every test position and prints the counts and speed
+    :return: 0 if every count is right, 1 otherwise
+    """
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    mismatches = 0
+    for name in EXPECTED_COUNTS:
+        for depth, expected in enumerate(EXPECTED_COUNTS[name][:max_depth], 1):
+            start = time.perf_counter()
+            nodes = perft(depth, make_game(name))
+            elapsed = time.perf_counter() - start
+            print("{:14s} depth {}: {:9d} nodes  {:10.0f} nodes/s".format(name, depth, nodes, nodes / elapsed))
+            if nodes != expected:
+                print("MISMATCH {} depth {}: expected {}, found {}".format(name, depth, expected, nodes))
+                mismatches += 1
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
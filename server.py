@@ -0,0 +1,636 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: An asyncio server hosting many games of Gess at once, and a load-test client for it. Clients talk to
+#              the server over TCP with one JSON object per line. Every request can carry an "id" that is sent back
+#              with its reply, and after every move both players are sent the new state of the game.
+#              Requests:
+#                {"op": "create", "both": false}             start a game, seated as BLACK (or both sides)
+#                {"op": "join", "game": 1}                   take the WHITE seat of a game
+#                {"op": "choose_piece", "game": 1, "center": "m3"}
+#                {"op": "list_moves", "game": 1, "center": "m3"}   moves of one piece, or all moves without center
+#                {"op": "make_move", "game": 1, "center": "m3", "destination": "m6"}
+#                {"op": "engine_move", "game": 1}            let the search engine move for the current player
+#                {"op": "resign", "game": 1}
+#                {"op": "stats", "reset": false}             counts, and rule timings when run with --instrument
+#              Usage: python server.py [--port 8765] [--instrument]   or   python server.py --load-test 1000 5000 10000
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from GessGame import GessGame, BLACK, square_name
+
+
+def engine_move(black_stones, white_stones, side, time_limit):
+    """
+    Searches a position for the best move. Runs in a worker process, so it takes plain ints.
+    :param black_stones: bitboard of the black stones
+    :param white_stones: bitboard of the white stones
+    :param side: BLACK or WHITE, the side to move
+    :param time_limit: seconds the engine can take
+    :return: tuple of the center and destination coordinates, or None if there is no legal move
+    """
+    from engine import SearchEngine
+    game = GessGame()
+    game.load_position(black_stones, white_stones, side)
+    return SearchEngine(time_limit=time_limit).choose_move(game)
+
+
+def list_all_moves(black_stones, white_stones, side):
+    """
+    Lists every legal move of the side to move. Runs in a worker process, so it takes plain ints, and the
+    listing is encoded there too, since encoding it costs as much as working it out.
+    :param black_stones: bitboard of the black stones
+    :param white_stones: bitboard of the white stones
+    :param side: BLACK or WHITE, the side to move
+    :return: JSON of the list of [center, destination] coordinate pairs, as bytes
+    """
+    game = GessGame()
+    game.load_position(black_stones, white_stones, side)
+    return json.dumps([[square_name(center), square_name(new_center)]
+                       for center, new_center in game.get_board().get_position().generate_moves(side)]).encode()
+
+
+class Session:
+    """
+    Class to represent one game hosted by the server. It only holds the game and the connections seated at it,
+    so its memory doesn't grow as the game goes on.
+    Responsibilities:
+    Has a GessGame
+    Knows which connection plays each side
+    Collaborators:
+    GessGame
+    """
+    __slots__ = ('game_id', 'game', 'seats')
+
+    def __init__(self, game_id):
+        """
+        Init method to initialize a Session object
+        :param game_id: number of the game
+        """
+        self.game_id = game_id
+        self.game = GessGame()
+        self.seats = {'BLACK': None, 'WHITE': None}
+
+    def state(self):
+        """
+        Describes the game for sending to the players
+        :return: dict with the stones of both sides as hex bitboards, whose turn it is, stones left and game state
+        """
+        game = self.game
+        position = game.get_board().get_position()
+        return {
+            'event': 'state',
+            'game': self.game_id,
+            'black': format(position.get_stones(0), 'x'),
+            'white': format(position.get_stones(1), 'x'),
+            'turn': game.get_current_player().get_team(),
+            'black_stones': game.player_1.get_remaining_stones(),
+            'white_stones': game.player_2.get_remaining_stones(),
+            'state': game.get_game_state(),
+        }
+
+
+class GameServer:
+    """
+    Class to represent the server
+    Responsibilities:
+    Accepts connections and answers their requests
+    Hosts up to max_sessions games
+    Sends the state of a game to its players after every move
+    Runs engine moves and whole-side move listings in worker processes so the event loop never waits on them,
+    and remembers recent listings by position hash
+    Collaborators:
+    Session
+    SearchEngine, in the worker processes
+    """
+
+    def __init__(self, max_sessions=20000, engine_time=0.1, engine_workers=1, rules_workers=1,
+                 move_cache_size=4096, instrumentation=None):
+        """
+        Init method to initialize a GameServer object
+        :param max_sessions: most games that can be hosted at once
+        :param engine_time: seconds the engine takes for a move
+        :param engine_workers: number of processes for engine moves
+        :param rules_workers: number of processes for listing all the moves of a side
+        :param move_cache_size: most move listings remembered by position hash
+        :param instrumentation: enabled Instrumentation whose numbers are sent with the stats, or None
+        """
+        self._instrumentation = instrumentation
+        self._max_sessions = max_sessions
+        self._engine_time = engine_time
+        self._engine_workers = engine_workers
+        self._rules_workers = rules_workers
+        self._executor = None
+        self._rules_executor = None
+        self._move_cache_size = move_cache_size
+        self._move_cache = OrderedDict()  # position hash -> JSON of the moves, least recently used first
+        self._pending_listings = {}  # position hash -> future of a listing being worked out in a worker
+        self._sessions = {}
+        self._game_ids = itertools.count(1)
+        self._server = None
+        self._connections = {}
+        # game ids each connection is seated at, so a dropped connection can resign its games
+        self._seated = {}
+
+    def get_session_count(self):
+        """
+        Getter method
+        :return: number of games being hosted
+        """
+        return len(self._sessions)
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """
+        Starts listening for connections
+        :param host: address to listen on
+        :param port: port to listen on, 0 to pick a free one
+        :return: the port being listened on
+        """
+        # spawned rather than forked, so the workers don't hold copies of the connections' sockets
+        self._executor = ProcessPoolExecutor(self._engine_workers, mp_context=multiprocessing.get_context('spawn'))
+        self._rules_executor = ProcessPoolExecutor(self._rules_workers,
+                                                   mp_context=multiprocessing.get_context('spawn'))
+        # listing the starting position starts the rules workers before the first request and caches the
+        # listing every new game asks for first
+        position = GessGame().get_board().get_position()
+        self._move_cache[position.get_hash()] = await asyncio.get_running_loop().run_in_executor(
+            self._rules_executor, list_all_moves, position.get_stones(0), position.get_stones(1), BLACK)
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=1 << 16)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stops the server and the engine workers
+        :return: none
+        """
+        self._server.close()
+        for writer in self._connections:
+            writer.close()
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._rules_executor is not None:
+            self._rules_executor.shutdown()
+            self._rules_executor = None
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Answers the requests of one connection until it closes. When it closes, the sessions it was seated at
+        are resigned and dropped if nobody else is seated.
+        :param reader: asyncio StreamReader of the connection
+        :param writer: asyncio StreamWriter of the connection
+        :return: none
+        """
+        seated = set()
+        self._connections[writer] = asyncio.current_task()
+        self._seated[writer] = seated
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    reply = self._handle_request(request, writer, seated)
+                except (ValueError, KeyError, TypeError) as error:
+                    request = {}
+                    reply = {'ok': False, 'error': str(error)}
+                if reply is not None:
+                    self._send(writer, reply, request.get('id'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game_id in list(seated):
+                session = self._sessions.get(game_id)
+                if session is None:
+                    continue
+                for team, seat in session.seats.items():
+                    if seat is writer:
+                        session.seats[team] = None
+                        if session.game.get_game_state() == 'UNFINISHED':
+                            session.game.resign_game(self._player(session, team))
+                if session.seats['BLACK'] is None and session.seats['WHITE'] is None:
+                    del self._sessions[game_id]
+                else:
+                    self._push_state(session)
+            del self._connections[writer]
+            del self._seated[writer]
+            writer.close()
+
+    @staticmethod
+    def _send(writer, message, request_id=None):
+        """
+        Sends one message as a line of JSON
+        :param writer: asyncio StreamWriter of the connection
+        :param message: dict to send
+        :param request_id: id of the request being answered, if it had one
+        :return: none
+        """
+        if request_id is not None:
+            message['id'] = request_id
+        if not writer.is_closing():
+            writer.write(json.dumps(message).encode() + b'\n')
+
+    @staticmethod
+    def _player(session, team):
+        """
+        Finds the Player of a team
+        :param session: the Session
+        :param team: 'BLACK' or 'WHITE'
+        :return: the Player
+        """
+        return session.game.player_1 if team == 'BLACK' else session.game.player_2
+
+    def _push_state(self, session):
+        """
+        Sends the state of a game to everyone seated at it, and drops the session if the game is over
+        :param session: the Session
+        :return: none
+        """
+        state = session.state()
+        for writer in set(seat for seat in session.seats.values() if seat is not None):
+            self._send(writer, dict(state))
+        if session.game.get_game_state() != 'UNFINISHED':
+            self._sessions.pop(session.game_id, None)
+            for writer in session.seats.values():
+                if writer in self._seated:
+                    self._seated[writer].discard(session.game_id)
+
+    def _handle_request(self, request, writer, seated):
+        """
+        Answers one request. Every request is quick except engine_move and list_moves without a center, which are
+        answered later by a task.
+        :param request: the decoded request
+        :param writer: asyncio StreamWriter of the connection
+        :param seated: set of the game ids the connection is seated at
+        :return: the reply, or None if the reply is sent later
+        """
+        op = request['op']
+        if op == 'create':
+            if len(self._sessions) >= self._max_sessions:
+                return {'ok': False, 'error': 'server full'}
+            session = Session(next(self._game_ids))
+            self._sessions[session.game_id] = session
+            session.seats['BLACK'] = writer
+            if request.get('both'):
+                session.seats['WHITE'] = writer
+            seated.add(session.game_id)
+            return {'ok': True, 'game': session.game_id, 'team': 'BLACK'}
+        if op == 'stats':
+            reply = {'ok': True, 'sessions': len(self._sessions)}
+            if self._instrumentation is not None:
+                reply['rules'] = self._instrumentation.get_stats()
+                if request.get('reset'):
+                    self._instrumentation.reset()
+            return reply
+
+        session = self._sessions.get(request['game'])
+        if session is None:
+            return {'ok': False, 'error': 'no such game'}
+        game = session.game
+        if op == 'join':
+            if session.seats['WHITE'] is not None:
+                return {'ok': False, 'error': 'game is full'}
+            session.seats['WHITE'] = writer
+            seated.add(session.game_id)
+            return {'ok': True, 'game': session.game_id, 'team': 'WHITE'}
+        team = game.get_current_player().get_team()
+        if session.seats[team] is not writer:
+            return {'ok': False, 'error': 'not your turn'}
+        if op == 'choose_piece':
+            return {'ok': game.choose_piece(request['center'])}
+        if op == 'list_moves':
+            if 'center' not in request:
+                return self._list_all_moves(session, writer, request.get('id'))
+            if not game.choose_piece(request['center']):
+                return {'ok': False, 'error': 'not a valid piece'}
+            return {'ok': True, 'moves': game.get_board().possible_moves(game.get_current_player())}
+        if op == 'make_move':
+            moved = game.choose_piece(request['center']) and game.make_move(request['center'], request['destination'])
+            if moved:
+                self._push_state(session)
+            return {'ok': bool(moved)}
+        if op == 'resign':
+            game.resign_game(game.get_current_player())
+            self._push_state(session)
+            return {'ok': True}
+        if op == 'engine_move':
+            asyncio.get_running_loop().create_task(self._engine_move(session, writer, request.get('id')))
+            return None
+        return {'ok': False, 'error': 'unknown op'}
+
+    def _list_all_moves(self, session, writer, request_id):
+        """
+        Answers a listing of every move of the current player, from the cache if the position was listed recently
+        and otherwise by a task that lists it in a worker process
+        :param session: the Session
+        :param writer: asyncio StreamWriter of the connection that asked
+        :param request_id: id of the request
+        :return: None, the reply is sent by _send_moves
+        """
+        position = session.game.get_board().get_position()
+        key = position.get_hash()
+        moves = self._move_cache.get(key)
+        if moves is not None:
+            self._move_cache.move_to_end(key)
+            self._send_moves(writer, moves, request_id)
+        else:
+            asyncio.get_running_loop().create_task(self._list_moves_task(session, writer, request_id))
+        return None
+
+    @staticmethod
+    def _send_moves(writer, moves, request_id=None):
+        """
+        Sends the reply to list_moves without a center, putting the already encoded listing into it as it is
+        :param writer: asyncio StreamWriter of the connection
+        :param moves: JSON of the moves, from list_all_moves
+        :param request_id: id of the request being answered, if it had one
+        :return: none
+        """
+        if writer.is_closing():
+            return
+        reply = b'{"ok": true, "moves": ' + moves
+        if request_id is not None:
+            reply += b', "id": ' + json.dumps(request_id).encode()
+        writer.write(reply + b'}\n')
+
+    async def _list_moves_task(self, session, writer, request_id):
+        """
+        Lists every move of the current player of a game in a worker process and remembers the listing. Requests
+        for a position that is already being listed wait for that listing instead of starting another.
+        :param session: the Session
+        :param writer: asyncio StreamWriter of the connection that asked
+        :param request_id: id of the request
+        :return: none
+        """
+        position = session.game.get_board().get_position()
+        key = position.get_hash()
+        future = self._pending_listings.get(key)
+        if future is None:
+            future = self._pending_listings[key] = asyncio.get_running_loop().run_in_executor(
+                self._rules_executor, list_all_moves, position.get_stones(0), position.get_stones(1),
+                session.game.get_current_player().get_side())
+            future.add_done_callback(lambda done: self._pending_listings.pop(key, None))
+        try:
+            moves = await future
+        except Exception as error:
+            self._send(writer, {'ok': False, 'error': self._worker_error(error)}, request_id)
+            return
+        if key not in self._move_cache:
+            self._move_cache[key] = moves
+            if len(self._move_cache) > self._move_cache_size:
+                self._move_cache.popitem(last=False)
+        self._send_moves(writer, moves, request_id)
+
+    @staticmethod
+    def _worker_error(error):
+        """
+        Describes an error raised by a worker process, or by the pool when a worker died, for an error reply
+        :param error: the exception
+        :return: the description
+        """
+        return "worker failed: {}: {}".format(type(error).__name__, error)
+
+    async def _engine_move(self, session, writer, request_id):
+        """
+        Lets the engine move for the current player of a game, searching in a worker process
+        :param session: the Session
+        :param writer: asyncio StreamWriter of the connection that asked
+        :param request_id: id of the request
+        :return: none
+        """
+        game = session.game
+        position = game.get_board().get_position()
+        side = game.get_current_player().get_side()
+        try:
+            move = await asyncio.get_running_loop().run_in_executor(
+                self._executor, engine_move, position.get_stones(0), position.get_stones(1), side, self._engine_time)
+        except Exception as error:
+            self._send(writer, {'ok': False, 'error': self._worker_error(error)}, request_id)
+            return
+        moved = move is not None and game.get_game_state() == 'UNFINISHED' and \
+            game.get_current_player().get_side() == side and game.choose_piece(move[0]) and game.make_move(*move)
+        self._send(writer, {'ok': bool(moved), 'move': move}, request_id)
+        if moved:
+            self._push_state(session)
+
+
+def measure_session_memory(count=1000, moves=0, seed=1):
+    """
+    Measures the memory taken by each hosted game, after some moves have been played in it
+    :param count: number of sessions to create for the measurement
+    :param moves: number of random legal moves to play in each session before measuring
+    :param seed: seed for the random moves
+    :return: bytes per session
+    """
+    rng = random.Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sessions = [Session(game_id) for game_id in range(count)]
+    for session in sessions:
+        game = session.game
+        position = game.get_board().get_position()
+        for move_number in range(moves):
+            legal_moves = list(position.generate_moves(game.get_current_player().get_side()))
+            if not legal_moves or game.get_game_state() != 'UNFINISHED':
+                break
+            game.make_move_at(*rng.choice(legal_moves))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del sessions
+    return used / count
+
+
+class LoadTestClient:
+    """
+    Class to represent one connection of the load test, with many requests in flight at once
+    Responsibilities:
+    Sends requests and matches the replies to them by id
+    Records how long each kind of request took
+    Collaborators:
+    GameServer, over TCP
+    """
+
+    def __init__(self, latencies):
+        """
+        Init method to initialize a LoadTestClient object
+        :param latencies: dict of op -> list of seconds, shared by every client of a test
+        """
+        self._latencies = latencies
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+
+    async def connect(self, host, port):
+        """
+        Opens the connection
+        :param host: address of the server
+        :param port: port of the server
+        :return: none
+        """
+        self._reader, self._writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_replies())
+
+    async def _read_replies(self):
+        """
+        Hands each reply to the request waiting for it, skipping state events
+        :return: none
+        """
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self._pending.pop(message.get('id'), None)
+            if future is not None:
+                future.set_result(message)
+
+    async def request(self, op, **fields):
+        """
+        Sends a request and waits for its reply
+        :param op: name of the request
+        :param fields: the rest of the request
+        :return: the reply
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        fields['op'] = op
+        fields['id'] = request_id
+        start = time.perf_counter()
+        self._writer.write(json.dumps(fields).encode() + b'\n')
+        reply = await future
+        self._latencies.setdefault(op, []).append(time.perf_counter() - start)
+        return reply
+
+    async def close(self):
+        """
+        Closes the connection
+        :return: none
+        """
+        self._writer.close()
+        self._reader_task.cancel()
+
+
+async def _play_test_game(client, moves):
+    """
+    Plays a short game for the load test, seated at both sides
+    :param client: the LoadTestClient
+    :param moves: number of moves to make before resigning
+    :return: none
+    """
+    game_id = (await client.request('create', both=True))['game']
+    for move_number in range(moves):
+        legal_moves = (await client.request('list_moves', game=game_id))['moves']
+        if not legal_moves:
+            break
+        center, destination = legal_moves[move_number * 7 % len(legal_moves)]
+        await client.request('choose_piece', game=game_id, center=center)
+        if not (await client.request('make_move', game=game_id, center=center, destination=destination))['ok']:
+            break
+    await client.request('resign', game=game_id)
+
+
+def _percentile(values, fraction):
+    """
+    Finds a percentile of a list of numbers
+    :param values: the numbers
+    :param fraction: 0.5 for the median, 0.99 for the 99th percentile
+    :return: the percentile
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load_test(host, port, games, connections=100, moves=2):
+    """
+    Plays many games against a server at the same time and measures how long each kind of request takes
+    :param host: address of the server
+    :param port: port of the server
+    :param games: number of games played at once
+    :param connections: number of connections the games are spread over
+    :param moves: moves made in each game before it resigns
+    :return: dict of op -> dict with the count, p50 and p99 in milliseconds
+    """
+    latencies = {}
+    clients = [LoadTestClient(latencies) for connection in range(min(connections, games))]
+    for client in clients:
+        await client.connect(host, port)
+    await asyncio.gather(*(_play_test_game(clients[number % len(clients)], moves) for number in range(games)))
+    for client in clients:
+        await client.close()
+    return {op: {'count': len(values), 'p50_ms': _percentile(values, 0.5) * 1000,
+                 'p99_ms': _percentile(values, 0.99) * 1000}
+            for op, values in latencies.items()}
+
+
+async def _run_load_tests(game_counts, connections):
+    """
+    Starts a server on a free local port and load-tests it with each number of games
+    :param game_counts: list of numbers of games played at once
+    :param connections: number of connections
+    :return: none
+    """
+    server = GameServer(max_sessions=max(game_counts))
+    port = await server.start('127.0.0.1', 0)
+    print("{:.0f} bytes per new session, {:.0f} bytes per session after 100 moves".format(
+        measure_session_memory(), measure_session_memory(50, 100)))
+    for games in game_counts:
+        start = time.perf_counter()
+        report = await load_test('127.0.0.1', port, games, connections)
+        print("{} concurrent games in {:.1f} s".format(games, time.perf_counter() - start))
+        for op, numbers in report.items():
+            print("  {:12s} {:7d} requests  p50 {:7.2f} ms  p99 {:7.2f} ms".format(
+                op, numbers['count'], numbers['p50_ms'], numbers['p99_ms']))
+    await server.stop()
+
+
+def main():
+    """
+    Runs the server, or the load test with --load-test
+    :return: none
+    """
+    parser = argparse.ArgumentParser(description="Gess game server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-sessions', type=int, default=20000)
+    parser.add_argument('--engine-time', type=float, default=0.1)
+    parser.add_argument('--load-test', type=int, nargs='*', metavar='GAMES',
+                        help="load-test a local server with these numbers of concurrent games, e.g. 1000 5000 10000")
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--instrument', action='store_true', help="time the rule functions and report it in stats")
+    args = parser.parse_args()
+    if args.load_test is not None:
+        asyncio.run(_run_load_tests(args.load_test or [1000, 5000, 10000], args.connections))
+        return
+
+    async def serve():
+        instrumentation = None
+        if args.instrument:
+            from instrumentation import Instrumentation
+            instrumentation = Instrumentation()
+            instrumentation.enable()
+        server = GameServer(args.max_sessions, args.engine_time, instrumentation=instrumentation)
+        port = await server.start(args.host, args.port)
+        print("listening on {}:{}".format(args.host, port), file=sys.stderr)
+        await asyncio.Event().wait()
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
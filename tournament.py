@@ -0,0 +1,223 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: Headless self-play for Gess. Plays a number of games between two agents across a pool of processes
+#              and writes the result of each game to a JSON Lines file as soon as it finishes.
+#              Usage: python tournament.py AGENT_A AGENT_B [--games N] [--workers N] [--output FILE]
+#              where an agent is 'random', 'greedy', 'search[:seconds]', 'search-eval[:seconds]' or 'mcts[:seconds]'.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from GessGame import GessGame, FOOTPRINT
+
+_evaluator = None  # Evaluator shared by every 'search-eval' agent in this process, so its cache lasts across games
+
+
+class RandomAgent:
+    """
+    Class to represent a player that picks a random legal move
+    Responsibilities:
+    Chooses a move for the current player
+    Collaborators:
+    GessGame
+    """
+
+    def __init__(self, seed=None):
+        """
+        Init method to initialize a RandomAgent object
+        :param seed: seed for the random numbers
+        """
+        self._rng = random.Random(seed)
+
+    def choose_move(self, game):
+        """
+        Picks a random legal move for the current player
+        :param game: GessGame to move in
+        :return: tuple of the center and destination coordinates, or None if there is no legal move
+        """
+        moves = list(game.get_board().generate_all_moves(game.get_current_player()))
+        if not moves:
+            return None
+        return self._rng.choice(moves)
+
+
+class GreedyAgent:
+    """
+    Class to represent a player that takes the move capturing the most opposing stones, breaking ties at random
+    Responsibilities:
+    Chooses a move for the current player
+    Collaborators:
+    GessGame
+    """
+
+    def __init__(self, seed=None):
+        """
+        Init method to initialize a GreedyAgent object
+        :param seed: seed for the random numbers used to break ties
+        """
+        self._rng = random.Random(seed)
+
+    def choose_move(self, game):
+        """
+        Picks the legal move that captures the most opposing stones, or one that wins the game right away
+        :param game: GessGame to move in
+        :return: tuple of the center and destination coordinates, or None if there is no legal move
+        """
+        board = game.get_board()
+        position = board.get_position()
+        side = game.get_current_player().get_side()
+        opposing = position.get_stones(1 - side)
+        best_moves = []
+        best_score = -1
+        for center, new_center in position.generate_moves(side):
+            score = (opposing & FOOTPRINT[new_center]).bit_count()
+            if score:
+                game.push_move(center, new_center)
+                if game.get_game_state() != 'UNFINISHED':
+                    score = 1000
+                game.pop_move()
+            if score > best_score:
+                best_moves = [(center, new_center)]
+                best_score = score
+            elif score == best_score:
+                best_moves.append((center, new_center))
+        if not best_moves:
+            return None
+        center, new_center = self._rng.choice(best_moves)
+        return board.get_coordinate(center), board.get_coordinate(new_center)
+
+
+def make_agent(spec, seed=None):
+    """
+    Creates an agent from its name
+    :param spec: 'random', 'greedy', 'search', 'search-eval' or 'mcts', optionally followed by ':' and the seconds
+                 per move. 'search-eval' is the search engine with the cached evaluation from evaluation.py, which
+                 takes about 0.2 seconds to search the opening to depth 1, so it gets 0.5 seconds by default.
+    :param seed: seed for the agent's random numbers
+    :return: an object with a choose_move(game) method
+    """
+    name, _, seconds = spec.partition(':')
+    if name == 'random':
+        return RandomAgent(seed)
+    if name == 'greedy':
+        return GreedyAgent(seed)
+    if name == 'search':
+        from engine import SearchEngine
+        return SearchEngine(time_limit=float(seconds or 0.1))
+    if name == 'search-eval':
+        global _evaluator
+        from engine import SearchEngine
+        from evaluation import Evaluator
+        if _evaluator is None:
+            _evaluator = Evaluator()
+        return SearchEngine(time_limit=float(seconds or 0.5), evaluate=_evaluator)
+    if name == 'mcts':
+        from mcts import MCTSPlayer
+        return MCTSPlayer(workers=1, time_limit=float(seconds or 1.0), seed=seed)
+    raise ValueError("unknown agent: " + spec)
+
+
+def play_game(game_number, black_spec, white_spec, seed, max_moves=300):
+    """
+    Plays one game between two agents without printing anything. A player with no legal move resigns, and a game
+    reaching max_moves is a draw.
+    :param game_number: number of the game in the tournament
+    :param black_spec: agent playing black, see make_agent
+    :param white_spec: agent playing white, see make_agent
+    :param seed: seed for the agents
+    :param max_moves: most moves before the game is called a draw
+    :return: dict with the game number, agents, winner ('BLACK', 'WHITE' or None), number of moves, stones left
+             for each player and seconds taken
+    """
+    start = time.perf_counter()
+    game = GessGame()
+    agents = {'BLACK': make_agent(black_spec, seed), 'WHITE': make_agent(white_spec, seed + 1)}
+    moves = 0
+    while game.get_game_state() == 'UNFINISHED' and moves < max_moves:
+        player = game.get_current_player()
+        move = agents[player.get_team()].choose_move(game)
+        if move is None or not game.choose_piece(move[0]) or not game.make_move(move[0], move[1]):
+            game.resign_game(player)
+            break
+        moves += 1
+    state = game.get_game_state()
+    return {
+        'game': game_number,
+        'black': black_spec,
+        'white': white_spec,
+        'winner': None if state == 'UNFINISHED' else state[:-len('_WON')],
+        'moves': moves,
+        'black_stones': game.player_1.get_remaining_stones(),
+        'white_stones': game.player_2.get_remaining_stones(),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def run_tournament(agent_a, agent_b, games, output, workers=None, max_moves=300, seed=0):
+    """
+    Plays games between two agents, switching colors every game, and writes each result to the output file as a
+    line of JSON as soon as the game finishes
+    :param agent_a: first agent, see make_agent
+    :param agent_b: second agent
+    :param games: number of games
+    :param output: path of the JSON Lines file, '-' for standard output
+    :param workers: number of processes, every core if None
+    :param max_moves: most moves before a game is called a draw
+    :param seed: seed for the agents, game n uses seed + 2n and seed + 2n + 1
+    :return: dict of agent_a wins, agent_b wins and draws
+    """
+    summary = {'a_wins': 0, 'b_wins': 0, 'draws': 0}
+    out = sys.stdout if output == '-' else open(output, 'w')
+    try:
+        with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+            futures = []
+            for game_number in range(games):
+                black, white = (agent_a, agent_b) if game_number % 2 == 0 else (agent_b, agent_a)
+                futures.append(executor.submit(play_game, game_number, black, white, seed + 2 * game_number,
+                                               max_moves))
+            for future in as_completed(futures):
+                result = future.result()
+                out.write(json.dumps(result) + '\n')
+                out.flush()
+                if result['winner'] is None:
+                    summary['draws'] += 1
+                elif (result['winner'] == 'BLACK') == (result['game'] % 2 == 0):
+                    summary['a_wins'] += 1
+                else:
+                    summary['b_wins'] += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return summary
+
+
+def main():
+    """
+    Runs a tournament from the command line and prints the totals
+    :return: none
+    """
+    parser = argparse.ArgumentParser(description="Gess self-play tournament")
+    parser.add_argument('agent_a')
+    parser.add_argument('agent_b')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='results.jsonl')
+    parser.add_argument('--max-moves', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    summary = run_tournament(args.agent_a, args.agent_b, args.games, args.output, args.workers, args.max_moves,
+                             args.seed)
+    elapsed = time.perf_counter() - start
+    print("{}: {}  {}: {}  draws: {}  ({:.1f} games/s)".format(args.agent_a, summary['a_wins'], args.agent_b,
+                                                              summary['b_wins'], summary['draws'],
+                                                              args.games / elapsed), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
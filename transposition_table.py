@@ -0,0 +1,124 @@
+# Author: Josh Sanford
+# Date: 10/17/2026
+# Description: A fixed-size transposition table for searching Gess positions. Entries are looked up by the Zobrist
+#              hash kept by GessGame.Position and hold the depth, score, bound type and best move of a search.
+
+from array import array
+
+EXACT = 0  # the score is the exact value of the position
+LOWER_BOUND = 1  # the search failed high, the position is worth at least the score
+UPPER_BOUND = 2  # the search failed low, the position is worth at most the score
+NO_MOVE = 0  # stored when there is no best move, square 0 is never the center of a piece
+ENTRY_BYTES = 20  # key 8, score 4, move 4, depth 2, bound 1, generation 1
+
+
+class TranspositionTable:
+    """
+    Class to represent a transposition table. The entries are kept in parallel arrays so the table takes a fixed
+    amount of memory no matter how many positions are stored in it.
+    Responsibilities:
+    Stores the result of searching a position under its Zobrist hash
+    Looks up the stored result of a position
+    Decides which entry to keep when two positions share a slot
+    Collaborators:
+    none
+    """
+
+    def __init__(self, memory_bytes=16 * 1024 * 1024):
+        """
+        Init method to initialize a TranspositionTable object. The number of entries is the largest power of two
+        that fits in the memory cap, so a slot can be found by masking the hash.
+        :param memory_bytes: the most memory the entries can take
+        """
+        size = 1
+        while size * 2 * ENTRY_BYTES <= memory_bytes:
+            size *= 2
+        self._size = size
+        self._mask = size - 1
+        self.clear()
+
+    def get_size(self):
+        """
+        Getter method
+        :return: number of entries the table can hold
+        """
+        return self._size
+
+    def get_memory_bytes(self):
+        """
+        Getter method
+        :return: memory taken by the entries
+        """
+        return self._size * ENTRY_BYTES
+
+    def get_stats(self):
+        """
+        Getter method
+        :return: dict with the number of probe hits and misses
+        """
+        return {'hits': self._hits, 'misses': self._misses}
+
+    def new_search(self):
+        """
+        Starts a new search, so entries left from earlier searches are replaced before newer ones
+        :return: none
+        """
+        self._generation = self._generation % 255 + 1
+
+    def clear(self):
+        """
+        Empties the table
+        :return: none
+        """
+        size = self._size
+        self._keys = array('Q', bytes(8 * size))
+        self._scores = array('i', bytes(4 * size))
+        self._moves = array('I', bytes(4 * size))
+        self._depths = array('h', bytes(2 * size))
+        self._bounds = array('B', bytes(size))
+        self._generations = array('B', bytes(size))
+        self._generation = 1
+        self._hits = 0
+        self._misses = 0
+
+    def store(self, key, depth, score, bound, move=None):
+        """
+        Stores the result of a search. An entry is kept over the new one only if it is from the current search,
+        belongs to another position and was searched deeper.
+        :param key: Zobrist hash of the position
+        :param depth: depth the position was searched to
+        :param score: score of the position
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: best move as a (center, new_center) tuple of square indexes, or None
+        :return: none
+        """
+        index = key & self._mask
+        same_position = self._keys[index] == key
+        if not same_position and self._generations[index] == self._generation and self._depths[index] > depth:
+            return
+        self._keys[index] = key
+        self._scores[index] = score
+        self._depths[index] = depth
+        self._bounds[index] = bound
+        self._generations[index] = self._generation
+        if move is not None:
+            self._moves[index] = move[0] << 16 | move[1]
+        elif not same_position:
+            self._moves[index] = NO_MOVE
+
+    def probe(self, key):
+        """
+        Looks up a position
+        :param key: Zobrist hash of the position
+        :return: tuple of (depth, score, bound, move) where move is a (center, new_center) tuple or None,
+                 or None if the position isn't in the table
+        """
+        index = key & self._mask
+        if self._generations[index] == 0 or self._keys[index] != key:
+            self._misses += 1
+            return None
+        self._hits += 1
+        move = self._moves[index]
+        if move == NO_MOVE:
+            return self._depths[index], self._scores[index], self._bounds[index], None
+        return self._depths[index], self._scores[index], self._bounds[index], (move >> 16, move & 0xFFFF)